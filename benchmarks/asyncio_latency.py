@@ -0,0 +1,80 @@
+"""
+Event loop latency while coroutines log heavily to a slow sink,
+with the plain handler and with the :class:`ezlog.aio.AsyncioHandler`
+"""
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+
+import ezlog
+from ezlog.aio import AsyncioHandler
+
+RECORDS    = 2000
+TICK       = 0.001
+SINK_DELAY = 0.0002
+
+
+class SlowHandler(ezlog.LoggerHandler):
+    """Handler, that simulates slow IO (network filesystem, congested pipe)"""
+
+    def write(self, text: str):
+        time.sleep(SINK_DELAY)
+        super().write(text)
+
+
+async def ticker(lags: list[float], stop: asyncio.Event):
+    # measures how late the loop wakes up the coroutine
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def producer(logger: ezlog.Logger):
+    for i in range(RECORDS):
+        logger.info('Request {} handled in {} ms', i, 1.5)
+
+        if i % 10 == 0:
+            await asyncio.sleep(0)
+
+
+async def run(handler: ezlog.LoggerHandler) -> tuple[list[float], float]:
+    logger  = ezlog.Logger('Bench', handlers=[handler])
+    lags    = []
+    stop    = asyncio.Event()
+
+    tick_task = asyncio.create_task(ticker(lags, stop))
+
+    started = time.perf_counter()
+    await producer(logger)
+
+    if isinstance(handler, AsyncioHandler):
+        await handler.aflush()
+
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await tick_task
+
+    return lags, elapsed
+
+
+def report(name: str, lags: list[float], elapsed: float):
+    lags_ms = sorted(lag * 1000 for lag in lags)
+
+    print(f'{name:<16} records/sec: {RECORDS / elapsed:>10.0f}   '
+          f'loop lag ms p50: {statistics.median(lags_ms):>7.3f}   '
+          f'p99: {lags_ms[int(len(lags_ms) * 0.99) - 1]:>7.3f}   '
+          f'max: {lags_ms[-1]:>7.3f}')
+
+
+def main():
+    report('direct', *asyncio.run(run(SlowHandler(io.StringIO(), log_level='debug', colors=False))))
+    report('AsyncioHandler', *asyncio.run(run(AsyncioHandler(SlowHandler(io.StringIO(), log_level='debug', colors=False)))))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Records/sec of the :class:`ezlog.binary.BinaryHandler` compared with the text :class:`ezlog.FileHandler`
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import ezlog
+from ezlog.binary import BinaryHandler
+
+RECORDS = 50000
+
+
+def bench(name: str, handler: ezlog.LoggerHandler, path: str):
+    logger = ezlog.Logger('Bench', handlers=[handler])
+
+    started = time.perf_counter()
+
+    for i in range(RECORDS):
+        logger.info('Request {} from {} handled in {} ms', i, '127.0.0.1', 1.25)
+
+    handler.close()
+    elapsed = time.perf_counter() - started
+
+    print(f'{name:<24} records/sec: {RECORDS / elapsed:>10.0f}   file size: {os.path.getsize(path):>10} bytes')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        text_path    = os.path.join(directory, 'bench.log')
+        binary_path  = os.path.join(directory, 'bench.ezlb')
+
+        bench('FileHandler', ezlog.FileHandler(text_path, log_level='debug'), text_path)
+        bench('FileHandler (buffered)', ezlog.FileHandler(text_path, log_level='debug', buffer_size=1 << 16), text_path)
+        bench('BinaryHandler', BinaryHandler(binary_path, log_level='debug'), binary_path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Import time of the package, measured by ``python -X importtime`` in fresh interpreters.
+Measures ``import ezlog`` and the first use of the ``ezlog.Logger`` (time of the modules imported
+after the interpreter startup, median of the runs), and checks that the heavy modules
+(colorama, inspect, traceback, datetime) aren't imported by them.
+
+    PYTHONPATH=. python benchmarks/import_time.py --budget 5 --logger-budget 40
+
+Exit code is 1, when any budget is exceeded or a heavy module is imported
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# statements to measure: name -> code
+STATEMENTS = {
+    'import':  'import ezlog',
+    'logger':  'import ezlog; ezlog.Logger',
+}
+
+# modules, that must be imported only when they are needed
+HEAVY_MODULES = ('colorama', 'inspect', 'traceback', 'datetime')
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def importtime(code: str) -> list[tuple[str, int, int]]:
+    """Runs the code in the fresh interpreter
+
+    :returns: Imported modules: name, level of the nesting, cumulative time (µs)
+    """
+
+    # bytecode is written by the first run, so all runs measure the same (cached) imports
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            env=env, capture_output=True, text=True, check=True)
+
+    modules = []
+
+    for line in result.stderr.splitlines():
+        m = LINE.match(line)
+
+        if m is not None:
+            modules.append((m.group(4), (len(m.group(3)) - 1) // 2, int(m.group(2))))
+
+    return modules
+
+
+def measure(code: str, startup: set[str], runs: int) -> tuple[float, list[str], list[tuple[str, int]]]:
+    """Measures import time of the code
+
+    :returns: Median time (ms), imported modules and the slowest top-level imports (name, µs)
+    """
+
+    times    = []
+    modules  = []
+    slowest  = []
+
+    importtime(code)
+
+    for _ in range(runs):
+        imported = [m for m in importtime(code) if m[0] not in startup]
+        top      = [(name, us) for name, level, us in imported if level == 0]
+
+        times.append(sum(us for _, us in top) / 1000)
+
+        modules  = [name for name, _, _ in imported]
+        slowest  = sorted(top, key=lambda m: m[1], reverse=True)[:8]
+
+    return statistics.median(times), modules, slowest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Import time of the ezlog package')
+    parser.add_argument('-r', '--runs', type=int, default=9, help='runs of every statement')
+    parser.add_argument('--budget', type=float, default=5.0, help='budget of the "import ezlog" (ms)')
+    parser.add_argument('--logger-budget', type=float, default=40.0,
+                        help='budget of the "import ezlog; ezlog.Logger" (ms)')
+
+    args = parser.parse_args(argv)
+
+    budgets = {'import': args.budget, 'logger': args.logger_budget}
+
+    # modules imported by the interpreter startup aren't counted
+    startup = {name for name, _, _ in importtime('pass')}
+
+    ok = True
+
+    for name, code in STATEMENTS.items():
+        ms, modules, slowest = measure(code, startup, args.runs)
+
+        heavy    = [m for m in modules if m.split('.')[0] in HEAVY_MODULES]
+        passed   = ms <= budgets[name] and not heavy
+        ok       = ok and passed
+
+        print(f'{code:<32} {ms:>8.2f} ms   budget: {budgets[name]:>6.2f} ms   {"OK" if passed else "FAIL"}')
+
+        for module, us in slowest:
+            print(f'    {module:<28} {us / 1000:>8.2f} ms')
+
+        if heavy:
+            print(f'    heavy modules are imported: {", ".join(heavy)}')
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Serialization speed of the :class:`ezlog.jsonl.JsonLinesHandler` compared with ``json.dumps``
+of a dict per record (the same fields)
+"""
+
+import io
+import json
+import sys
+import time
+
+import ezlog
+from ezlog.jsonl import JsonLinesHandler
+
+RECORDS = 50000
+
+
+class DumpsHandler(JsonLinesHandler):
+    """Serializes the same fields with ``json.dumps`` of a dict"""
+
+    def serialize(self, record) -> str:
+        caller = record.caller
+
+        return json.dumps({'time':        record.time_str,
+                           'timestamp':   record.timestamp,
+                           'level':       ezlog.utils.level_to_name(record.level),
+                           'group_name':  record.group_name,
+                           'name':        record.name,
+                           'message':     record.text,
+                           'args':        [a if a is None or type(a) in (str, int, float, bool) else str(a)
+                                           for a in record.args],
+                           'caller':      {'file': caller.filename, 'function': caller.function, 'line': caller.lineno},
+                           'exception':   record.traceback_text if record.exception is not None else None})
+
+
+def bench(name: str, handler: JsonLinesHandler):
+    group   = ezlog.LoggerGroup('Bench', handlers=[handler])
+    logger  = ezlog.Logger('Json', group=group)
+
+    # records are created once, so only serialization is measured
+    records = []
+
+    class Collector(ezlog.LoggerHandler):
+        def emit(self, record):
+            records.append(record)
+
+    logger.handlers = [Collector(log_level='debug')]
+
+    for i in range(RECORDS):
+        logger.info('Request {} from {} handled in {} ms', i, '127.0.0.1', 1.25)
+
+    # texts of the records are memoized, so both serializers measure only their own work
+    for record in records:
+        record.text, record.time_str
+
+    started = time.perf_counter()
+
+    for record in records:
+        handler.serialize(record)
+
+    elapsed = time.perf_counter() - started
+
+    print(f'{name:<18} records/sec: {RECORDS / elapsed:>10.0f}')
+
+
+def main():
+    bench('JsonLinesHandler', JsonLinesHandler(io.StringIO(), log_level='debug'))
+    bench('json.dumps', DumpsHandler(io.StringIO(), log_level='debug'))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Benchmark suite of the ``Logger.record`` hot path. Measures records/sec, latency percentiles of one call
+and memory allocated by the calls (``tracemalloc``) for every scenario.
+
+Results can be saved as a baseline and compared with it later::
+
+    PYTHONPATH=. python benchmarks/run.py --save baseline.json
+    PYTHONPATH=. python benchmarks/run.py --baseline baseline.json --threshold 0.15
+
+Exit code is 1, when throughput (best of the repeats) of any scenario is lower than the baseline
+by more than the threshold. Latency of one call is noisier, so its changes are only reported
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+import typing
+
+import ezlog
+
+WARMUP       = 1000
+ALLOC_CALLS  = 1000
+
+Step = typing.Callable[[], None]
+
+# scenarios: name -> (setup, count of threads)
+SCENARIOS: dict[str, tuple[typing.Callable[[], Step], int]] = {}
+
+
+def scenario(name: str, threads: int = 1):
+    """Registers setup function of the scenario. Setup returns function, that does one call"""
+
+    def decorator(setup: typing.Callable[[], Step]) -> typing.Callable[[], Step]:
+        SCENARIOS[name] = (setup, threads)
+        return setup
+
+    return decorator
+
+
+class NullIO:
+    """Sink, that drops written text (only the cost of the handler is measured)"""
+
+    closed = False
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class Opaque:
+    """Object of the user type (colored by the ``all`` color)"""
+
+    def __str__(self):
+        return 'Opaque()'
+
+
+def handler(**kwargs: typing.Any) -> ezlog.LoggerHandler:
+    kwargs.setdefault('log_level', 'debug')
+    kwargs.setdefault('colors', False)
+
+    return ezlog.LoggerHandler(NullIO(), **kwargs)
+
+
+@scenario('filtered_debug')
+def filtered_debug() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[handler(log_level='info')])
+    return lambda: logger.debug('Filtered {} record', 1)
+
+
+@scenario('plain')
+def plain() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[handler()])
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('colored')
+def colored() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[handler(colors=True)])
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('many_args')
+def many_args() -> Step:
+    logger  = ezlog.Logger('Bench', handlers=[handler(colors=True)])
+    obj     = Opaque()
+
+    return lambda: logger.info('{} {} {} {} {} {} {} {} {} {}',
+                               1, 2.5, True, 'text', b'bytes', [1, 2], (3, 4), None, {'a': 1}, obj)
+
+
+@scenario('exception')
+def exception() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[handler(colors=True)])
+
+    try:
+        raise ValueError('Bench exception')
+    except ValueError as e:
+        error = e
+
+    return lambda: logger.error('Failed {}', 'request', exception=error)
+
+
+@scenario('multi_handlers')
+def multi_handlers() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[handler(), handler(colors=True),
+                                             handler(log_level='info'), handler(log_level='error')])
+
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('multi_sink')
+def multi_sink() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[ezlog.FileHandler(os.devnull, log_level='debug') for _ in range(3)])
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('multi_sink_raw')
+def multi_sink_raw() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[ezlog.FileHandler(os.devnull, log_level='debug', raw=True)
+                                             for _ in range(3)])
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('groups')
+def groups() -> Step:
+    root    = ezlog.LoggerGroup('BenchRoot', handlers=[handler()])
+    middle  = ezlog.LoggerGroup('Middle', parent=root)
+    leaf    = ezlog.LoggerGroup('Leaf', parent=middle)
+    logger  = ezlog.Logger('Bench', group=leaf)
+
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('threads', threads=4)
+def threads() -> Step:
+    logger = ezlog.Logger('Bench', handlers=[handler()])
+    return lambda: logger.info('Request {} handled in {} ms', 42, 1.5)
+
+
+@scenario('format_message')
+def format_message() -> Step:
+    logger  = ezlog.Logger('Bench', handlers=[handler()])
+    stack   = ezlog.utils.CallerInfo(sys._getframe())
+
+    return lambda: logger.format_message('Request {} handled in {} ms', ['42', '1.5'], 'INFO', 'TIME', stack)
+
+
+@scenario('format_time')
+def format_time() -> Step:
+    logger  = ezlog.Logger('Bench', handlers=[handler()])
+    now     = datetime.datetime.now()
+
+    return lambda: logger.format_time(now)
+
+
+def run_threads(step: Step, threads: int, calls: int, latencies: list[int] | None):
+    """Runs calls of the step in the threads (latencies are collected, if list is given)"""
+
+    def worker():
+        if latencies is None:
+            for _ in range(calls // threads):
+                step()
+            return
+
+        local   = []
+        clock   = time.perf_counter_ns
+
+        for _ in range(calls // threads):
+            started = clock()
+            step()
+            local.append(clock() - started)
+
+        latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+
+def measure(name: str, records: int, repeat: int) -> dict[str, float]:
+    """Measures the scenario
+
+    :returns: records/sec, latency percentiles (µs) and allocations
+    """
+
+    setup, threads = SCENARIOS[name]
+    step = setup()
+
+    run_threads(step, threads, WARMUP, None)
+
+    # throughput (best of the repeats)
+    best = 0.0
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_threads(step, threads, records, None)
+        best = max(best, records / (time.perf_counter() - started))
+
+    # latency of one call (percentiles of the repeat with the lowest median)
+    def percentile(latencies: list[int], p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] / 1000
+
+    latencies = None
+
+    for _ in range(repeat):
+        run = []
+        run_threads(step, threads, min(records, 20000), run)
+        run.sort()
+
+        if latencies is None or percentile(run, 0.50) < percentile(latencies, 0.50):
+            latencies = run
+
+    # allocations
+    tracemalloc.start()
+    run_threads(step, threads, ALLOC_CALLS, None)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'records_per_sec':   round(best, 1),
+            'p50_us':            round(percentile(latencies, 0.50), 3),
+            'p90_us':            round(percentile(latencies, 0.90), 3),
+            'p99_us':            round(percentile(latencies, 0.99), 3),
+            'alloc_peak_kib':    round(peak / 1024, 2),
+            'retained_b_call':   round(current / ALLOC_CALLS, 1)}
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Finds regressions: lower records/sec (best of the repeats), than the baseline by the threshold"""
+
+    regressions = []
+
+    for name, result in results.items():
+        base = baseline.get(name)
+
+        if base is None:
+            continue
+
+        if result['records_per_sec'] < base['records_per_sec'] * (1 - threshold):
+            regressions.append(f'{name}: records/sec {result["records_per_sec"]:.0f} < '
+                               f'baseline {base["records_per_sec"]:.0f}')
+
+    return regressions
+
+
+def latency_changes(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Finds higher median latency, than the baseline by the threshold (it doesn't fail the run)"""
+
+    changes = []
+
+    for name, result in results.items():
+        base = baseline.get(name)
+
+        if base is not None and result['p50_us'] > base['p50_us'] * (1 + threshold):
+            changes.append(f'{name}: p50 {result["p50_us"]:.3f} µs > baseline {base["p50_us"]:.3f} µs')
+
+    return changes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks of the Logger.record hot path')
+    parser.add_argument('scenarios', nargs='*', help=f'scenarios to run (all by default): {", ".join(SCENARIOS)}')
+    parser.add_argument('-n', '--records', type=int, default=50000, help='records per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='repeats of the throughput and latency measurements')
+    parser.add_argument('--save', metavar='PATH', help='save results as the baseline JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='compare results with the baseline JSON')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed regression (0.10 = 10%%)')
+
+    args = parser.parse_args(argv)
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f'unknown scenario "{name}"')
+
+    results = {}
+
+    print(f'{"scenario":<16} {"records/sec":>12} {"p50 µs":>9} {"p90 µs":>9} {"p99 µs":>9} '
+          f'{"peak KiB":>9} {"B/call":>8}')
+
+    for name in args.scenarios or SCENARIOS:
+        r = results[name] = measure(name, args.records, args.repeat)
+
+        print(f'{name:<16} {r["records_per_sec"]:>12.0f} {r["p50_us"]:>9.3f} {r["p90_us"]:>9.3f} '
+              f'{r["p99_us"]:>9.3f} {r["alloc_peak_kib"]:>9.2f} {r["retained_b_call"]:>8.1f}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'python':     platform.python_version(),
+                       'platform':   platform.platform(),
+                       'results':    results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        if baseline.get('python') != platform.python_version():
+            print(f'warning: baseline was measured on Python {baseline.get("python")}', file=sys.stderr)
+
+        regressions = compare(results, baseline['results'], args.threshold)
+
+        for line in latency_changes(results, baseline['results'], args.threshold):
+            print(f'note: {line}', file=sys.stderr)
+
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
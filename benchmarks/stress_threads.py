@@ -0,0 +1,149 @@
+"""
+Stress test of the thread-safety of the handlers. Many threads log records with long messages
+and tracebacks into the file (unbuffered, buffered and raw handlers), then the file is checked:
+every record must be written as one unit (no torn lines, traceback follows its message)
+and records of every thread must keep their order. Exit code is 1, when the check fails
+
+    PYTHONPATH=. python benchmarks/stress_threads.py --threads 32 --records 2000
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+import ezlog
+
+PAYLOAD = 'x' * 300
+
+ANSI = re.compile(r'\x1b\[[0-9;]*m')
+RECORD = re.compile(r'^T(\d+) R(\d+) (x+) END$')
+TRACEBACK_END = re.compile(r'^ValueError: T(\d+) R(\d+)$')
+
+
+def worker(logger: ezlog.Logger, number: int, records: int, barrier: threading.Barrier):
+    barrier.wait()
+
+    for i in range(records):
+        if i % 50 == 0:
+            try:
+                raise ValueError(f'T{number} R{i}')
+            except ValueError as e:
+                logger.error('T{} R{} {} END', number, i, PAYLOAD, exception=e)
+        else:
+            logger.info('T{} R{} {} END', number, i, PAYLOAD)
+
+
+def check(path: str, threads: int, records: int) -> list[str]:
+    """Checks written log
+
+    :returns: Found errors
+    """
+
+    errors  = []
+    last    = {}
+    pending = None
+
+    with open(path, encoding='utf-8') as f:
+        for n, line in enumerate(f, 1):
+            line = ANSI.sub('', line.rstrip('\n'))
+            m = RECORD.match(line)
+
+            if m is not None:
+                if pending is not None:
+                    errors.append(f'line {n}: traceback of T{pending[0]} R{pending[1]} is not finished')
+
+                number, i = int(m.group(1)), int(m.group(2))
+
+                if len(m.group(3)) != len(PAYLOAD):
+                    errors.append(f'line {n}: payload of T{number} R{i} is torn')
+
+                if last.get(number, -1) != i - 1:
+                    errors.append(f'line {n}: T{number} R{i} follows R{last.get(number)}')
+
+                last[number]  = i
+                pending       = (number, i) if i % 50 == 0 else None
+                continue
+
+            if pending is None:
+                errors.append(f'line {n}: unexpected line {line[:80]!r}')
+                continue
+
+            m = TRACEBACK_END.match(line)
+
+            if m is not None:
+                if (int(m.group(1)), int(m.group(2))) != pending:
+                    errors.append(f'line {n}: traceback of T{m.group(1)} R{m.group(2)} '
+                                  f'follows T{pending[0]} R{pending[1]}')
+                pending = None
+
+            elif not line.startswith(('Traceback', '  ')):
+                errors.append(f'line {n}: unexpected traceback line {line[:80]!r}')
+
+        for number in range(threads):
+            if last.get(number) != records - 1:
+                errors.append(f'T{number}: {last.get(number, -1) + 1} of {records} records are written')
+
+    return errors
+
+
+def run(name: str, threads: int, records: int, **handler_kwargs) -> bool:
+    fd, path = tempfile.mkstemp(suffix='.log')
+    os.close(fd)
+
+    try:
+        handler = ezlog.FileHandler(path, log_level='debug', **handler_kwargs)
+        logger  = ezlog.Logger('Stress', formatter='{message}', handlers=[handler], capture_caller=False)
+        barrier = threading.Barrier(threads)
+
+        workers = [threading.Thread(target=worker, args=(logger, i, records, barrier)) for i in range(threads)]
+
+        started = time.perf_counter()
+
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+        handler.flush()
+        elapsed = time.perf_counter() - started
+
+        handler.close()
+
+        errors = check(path, threads, records)
+
+        print(f'{name:<10} threads: {threads:>3}   records/sec: {threads * records / elapsed:>9.0f}   '
+              f'errors: {len(errors)}')
+
+        for error in errors[:20]:
+            print(f'    {error}')
+
+        return not errors
+
+    finally:
+        os.remove(path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Thread-safety stress test of the handlers')
+    parser.add_argument('-t', '--threads', type=int, default=32, help='count of the threads')
+    parser.add_argument('-n', '--records', type=int, default=2000, help='records per thread')
+
+    args = parser.parse_args(argv)
+
+    # small switch interval makes interleaving of the threads more likely
+    sys.setswitchinterval(1e-6)
+
+    ok = run('direct', args.threads, args.records)
+    ok = run('buffered', args.threads, args.records, buffer_size=1 << 16, flush_interval=0.05) and ok
+    ok = run('raw', args.threads, args.records, raw=True) and ok
+    ok = run('raw_buf', args.threads, args.records, raw=True, buffer_size=1 << 16, flush_interval=0.05) and ok
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+
+import multiprocessing
+
+import ezlog
+from ezlog.multiprocess import LogAggregator, ProcessHandler
+
+
+def worker(number: int, channel):
+    # records are sent to the aggregator of the main process
+    workers_group = ezlog.LoggerGroup('Workers', handlers=[ProcessHandler(channel, log_level='debug')])
+    logger = ezlog.Logger(f'Worker-{number}', group=workers_group)
+
+    for i in range(5):
+        logger.info('Task {} is done', i)
+
+
+if __name__ == '__main__':
+    # only the main process writes into the file
+    aggregator = LogAggregator([ezlog.FileHandler('multiprocess.log', log_level='debug'),
+                                ezlog.StdoutHandler(log_level='info', colors=False)])
+    aggregator.start()
+
+    processes = [multiprocessing.Process(target=worker, args=(n, aggregator.open_channel())) for n in range(8)]
+
+    for p in processes:
+        p.start()
+
+    for p in processes:
+        p.join()
+
+    aggregator.stop()
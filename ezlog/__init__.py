@@ -2,18 +2,59 @@
 Small simple colored logging library
 """
 
-import colorama
 import sys
 
 # Fix colors for the windows
 if sys.platform == 'win32':
+    import colorama
+
     colorama.just_fix_windows_console()
     colorama.init()
 
 ####
 
-from .logger import *
-from .loggergroup import *
-from .handlers import *
-from .utils import LogLevel
-from . import utils, _types, defaults, exceptions
+# public names -> modules, that declare them (modules are imported on the first access)
+_EXPORTS = {
+    'Logger':                  '.logger',
+    'reset':                   '.logger',
+    'DEFAULT_COLOR_SET':       '.defaults',
+    'DEFAULT_FORMATTER':       '.defaults',
+    'DEFAULT_TIME_FORMATTER':  '.defaults',
+    'LoggerGroup':             '.loggergroup',
+    'LOGGER_GROUPS':           '.loggergroup',
+    'get_group':               '.loggergroup',
+    'LoggerHandler':           '.handlers',
+    'HandlerList':             '.handlers',
+    'QueueHandler':            '.handlers',
+    'FileHandler':             '.handlers',
+    'RotatingFileHandler':     '.handlers',
+    'StdoutHandler':           '.handlers',
+    'StderrHandler':           '.handlers',
+    'LogLevel':                '.utils',
+    'Lazy':                    '.lazy',
+}
+
+# submodules, available as attributes of the package without importing them
+_SUBMODULES = frozenset({'logger', 'loggergroup', 'handlers', 'utils', '_types', 'defaults', 'exceptions',
+                         'template', 'timeformat', 'record', 'tracebacks', 'metrics', 'ratelimit', 'lazy'})
+
+__all__ = list(_EXPORTS) + sorted(name for name in _SUBMODULES if not name.startswith('_'))
+
+
+def __getattr__(name: str):
+    import importlib
+
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+
+    module = _EXPORTS.get(name)
+
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = globals()[name] = getattr(importlib.import_module(module, __name__), name)
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
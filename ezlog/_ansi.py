@@ -0,0 +1,66 @@
+"""
+ANSI escape codes of the colors and styles. Same names and codes, as in the ``colorama``
+(``Fore``, ``Back``, ``Style``), but without importing it: ``colorama`` is needed only to fix
+the console on Windows
+"""
+
+__all__ = ['Fore', 'Back', 'Style']
+
+
+def _code(number: int) -> str:
+    return f'\x1b[{number}m'
+
+
+class Fore:
+    """Foreground colors"""
+
+    BLACK            = _code(30)
+    RED              = _code(31)
+    GREEN            = _code(32)
+    YELLOW           = _code(33)
+    BLUE             = _code(34)
+    MAGENTA          = _code(35)
+    CYAN             = _code(36)
+    WHITE            = _code(37)
+    RESET            = _code(39)
+
+    LIGHTBLACK_EX    = _code(90)
+    LIGHTRED_EX      = _code(91)
+    LIGHTGREEN_EX    = _code(92)
+    LIGHTYELLOW_EX   = _code(93)
+    LIGHTBLUE_EX     = _code(94)
+    LIGHTMAGENTA_EX  = _code(95)
+    LIGHTCYAN_EX     = _code(96)
+    LIGHTWHITE_EX    = _code(97)
+
+
+class Back:
+    """Background colors"""
+
+    BLACK            = _code(40)
+    RED              = _code(41)
+    GREEN            = _code(42)
+    YELLOW           = _code(43)
+    BLUE             = _code(44)
+    MAGENTA          = _code(45)
+    CYAN             = _code(46)
+    WHITE            = _code(47)
+    RESET            = _code(49)
+
+    LIGHTBLACK_EX    = _code(100)
+    LIGHTRED_EX      = _code(101)
+    LIGHTGREEN_EX    = _code(102)
+    LIGHTYELLOW_EX   = _code(103)
+    LIGHTBLUE_EX     = _code(104)
+    LIGHTMAGENTA_EX  = _code(105)
+    LIGHTCYAN_EX     = _code(106)
+    LIGHTWHITE_EX    = _code(107)
+
+
+class Style:
+    """Styles"""
+
+    BRIGHT     = _code(1)
+    DIM        = _code(2)
+    NORMAL     = _code(22)
+    RESET_ALL  = _code(0)
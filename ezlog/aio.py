@@ -0,0 +1,145 @@
+"""
+Asyncio support. Handler, that never blocks the event loop by IO
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import weakref
+
+from .handlers import LoggerHandler, _WrapperHandler
+
+__all__ = ['AsyncioHandler']
+
+
+class AsyncioHandler(_WrapperHandler):
+    """Wraps a handler for usage from the coroutines.
+       Records logged in the event loop thread are collected and written by the wrapped handler
+       in the executor (one write per loop iteration), so the event loop is never blocked by IO.
+       Records from the other threads are passed to the executor directly.
+
+       Use :meth:`aflush` to wait until all records are written (for example, at shutdown).
+       Records are rendered by the wrapped handler (see :class:`ezlog.handlers._WrapperHandler`)
+
+    :ivar handler: Wrapped handler
+    :type handler: LoggerHandler
+    """
+
+    def __init__(self,
+                 handler: LoggerHandler,
+                 executor: concurrent.futures.Executor | None = None):
+        """
+        :param handler: Handler to wrap
+        :type handler: LoggerHandler
+        :param executor: Executor to write records in. By default, own single-thread executor
+                         is used (it keeps order of the records)
+        :type executor: concurrent.futures.Executor | None
+
+        :raises TypeError: When handler doesn't write rendered text
+        """
+
+        super().__init__(handler)
+
+        self.executor = executor if executor is not None else \
+            concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='ezlog-aio')
+
+        # records collected in the current loop iteration
+        self._pending    = []
+        self._scheduled  = False
+        self._futures    = set()
+
+        _asyncio_handlers.add(self)
+
+    def handle(self, text: str, level: int):
+        """Collects record to write it in the executor
+
+        :param text: Rendered record
+        :type text: str
+        :param level: Level of the record
+        :type level: int
+        """
+
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            # called outside of the event loop
+            self._submit([(text, level)])
+            return
+
+        self._pending.append((text, level))
+
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._submit_pending)
+
+    def _submit_pending(self):
+        self._scheduled = False
+
+        records, self._pending = self._pending, []
+        self._submit(records)
+
+    def _submit(self, records: list[tuple[str, int]]):
+        if not records:
+            return
+
+        text   = ''.join([r[0] for r in records])
+        level  = max([r[1] for r in records])
+
+        try:
+            future = self.executor.submit(self.handler.handle, text, level)
+
+        except RuntimeError:
+            # executor is shut down (interpreter exit)
+            self.handler.handle(text, level)
+            return
+
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+    async def aflush(self):
+        """Waits until all collected records are written and flushes the wrapped handler"""
+
+        self._submit_pending()
+
+        if self._futures:
+            await asyncio.gather(*[asyncio.wrap_future(f) for f in list(self._futures)])
+
+        await asyncio.wrap_future(self.executor.submit(self.handler.flush))
+
+    async def aclose(self):
+        """Writes all collected records and closes the wrapped handler"""
+
+        await self.aflush()
+        await asyncio.wrap_future(self.executor.submit(self.handler.close))
+
+    def flush(self):
+        """Writes all collected records (blocking). Use :meth:`aflush` inside of the coroutines"""
+
+        self._submit_pending()
+
+        for future in list(self._futures):
+            future.result()
+
+        self.handler.flush()
+
+    def close(self):
+        """Writes all collected records and closes the wrapped handler (blocking)"""
+
+        self.flush()
+        self.handler.close()
+
+
+def _flush_asyncio_handlers():
+    for handler in list(_asyncio_handlers):
+        # executor may be already shut down, so write records directly
+        records, handler._pending = handler._pending, []
+
+        for text, level in records:
+            handler.handler.handle(text, level)
+
+        handler.handler.flush()
+
+
+_asyncio_handlers = weakref.WeakSet()
+atexit.register(_flush_asyncio_handlers)
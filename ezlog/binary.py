@@ -0,0 +1,474 @@
+"""
+Binary log format with deferred formatting. Records are written as call site ID, time, level
+and raw arguments, text is rendered offline by ``python -m ezlog.decode``.
+
+Format of the stream: magic ``EZLB`` and version, followed by frames. Every frame starts with a tag:
+
+* ``S`` - string definition: id (uint32), length (uint32), utf-8 data
+* ``C`` - call site definition: id (uint32), lineno (uint32) and string ids of formatter, time formatter,
+  group name, logger name, message, file name and function name
+* ``R`` - record: call site id (uint32), time in ns (int64), level (int32), count of arguments (uint16), arguments
+* ``X`` - traceback of the previous record: string length (uint32), utf-8 data
+
+Every argument starts with a type tag (see :data:`ARG_TAGS`). Magic in the middle of the stream
+starts a new session (file was reopened in the append mode), ids of the previous session are discarded
+"""
+
+import struct
+import threading
+import time
+import typing
+from os import PathLike
+
+from .handlers import LoggerHandler, _flusher
+
+if typing.TYPE_CHECKING:
+    from .record import LogRecord
+
+__all__ = ['MAGIC', 'ARG_TAGS', 'BinaryHandler', 'CallSite', 'OpaqueArg', 'BinaryRecord', 'read_records']
+
+MAGIC = b'EZLB\x01'
+"""Magic and version of the binary stream"""
+
+ARG_TAGS = {
+    b'n': 'None',
+    b'T': 'True',
+    b'F': 'False',
+    b'i': 'int (int64)',
+    b'I': 'int (decimal string)',
+    b'f': 'float (double)',
+    b's': 'str',
+    b'y': 'bytes',
+    b'o': 'other type: type name string id and str() of the object',
+}
+"""Type tags of the arguments"""
+
+_U32     = struct.Struct('<I')
+_I64     = struct.Struct('<q')
+_F64     = struct.Struct('<d')
+_STRING  = struct.Struct('<cII')
+_SITE    = struct.Struct('<cIIIIIIIII')
+_RECORD  = struct.Struct('<cIqiH')
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+class _RecordEncoder:
+    """Encodes records into the frames of the binary stream. Keeps ids of the strings and call sites,
+       defined in the stream (see :class:`BinaryHandler` and :class:`ezlog.multiprocess.ProcessHandler`)
+
+    :ivar max_definitions: Max count of the strings and call sites of one session
+    :type max_definitions: int
+    """
+
+    def __init__(self, max_definitions: int = 1 << 16):
+        """
+        :param max_definitions: Max count of the strings and call sites of one session
+        :type max_definitions: int
+        """
+
+        self.max_definitions  = max_definitions
+        self.strings          = {}
+        self.sites            = {}
+
+    def _string_id(self, out: list[bytes], text: str) -> int:
+        string_id = self.strings.get(text)
+
+        if string_id is None:
+            data = text.encode('utf-8', 'surrogateescape')
+
+            string_id = self.strings[text] = len(self.strings)
+            out.append(_STRING.pack(b'S', string_id, len(data)) + data)
+
+        return string_id
+
+    def _site_id(self, out: list[bytes], record: 'LogRecord') -> int:
+        caller  = record.caller
+        logger  = record.logger
+
+        key = (record.message, record.name, record.group_name, caller.filename, caller.function, caller.lineno,
+               logger.formatter, logger.time_formatter)
+
+        site_id = self.sites.get(key)
+
+        if site_id is None:
+            site_id = self.sites[key] = len(self.sites)
+
+            out.append(_SITE.pack(b'C', site_id, caller.lineno,
+                                  *[self._string_id(out, s) for s in (logger.formatter, logger.time_formatter,
+                                                                      record.group_name, record.name, record.message,
+                                                                      caller.filename, caller.function)]))
+
+        return site_id
+
+    def _encode_arg(self, defs: list[bytes], out: list[bytes], arg: typing.Any, text: str):
+        t = type(arg)
+
+        if arg is None:
+            out.append(b'n')
+        elif t is bool:
+            out.append(b'T' if arg else b'F')
+        elif t is int:
+            if _INT64_MIN <= arg <= _INT64_MAX:
+                out.append(b'i' + _I64.pack(arg))
+            else:
+                data = str(arg).encode()
+                out.append(b'I' + _U32.pack(len(data)) + data)
+        elif t is float:
+            out.append(b'f' + _F64.pack(arg))
+        elif t is str:
+            data = text.encode('utf-8', 'surrogateescape')
+            out.append(b's' + _U32.pack(len(data)) + data)
+        elif t is bytes:
+            out.append(b'y' + _U32.pack(len(arg)) + arg)
+        else:
+            # type name is defined before the record
+            type_id = self._string_id(defs, f'{t.__module__}.{t.__qualname__}')
+            data = text.encode('utf-8', 'surrogateescape')
+            out.append(b'o' + _U32.pack(type_id) + _U32.pack(len(data)) + data)
+
+    def encode(self, record: 'LogRecord', exceptions: bool = True) -> bytes:
+        """Encodes record with the definitions of its new strings and call site (calls must be serialized)
+
+        :param record: Record to encode
+        :type record: LogRecord
+        :param exceptions: Encode traceback of the exception
+        :type exceptions: bool
+
+        :returns: Frames of the record
+        :rtype: bytes
+        """
+
+        defs  = []
+        out   = []
+
+        if len(self.strings) + len(self.sites) >= self.max_definitions:
+            # new session: ids of the previous one are discarded by the reader
+            self.strings.clear()
+            self.sites.clear()
+            defs.append(MAGIC)
+
+        site_id = self._site_id(defs, record)
+        out.append(_RECORD.pack(b'R', site_id, record.timestamp, record.level, len(record.args)))
+
+        # lazy arguments are evaluated, strings of the arguments are shared with the text handlers
+        for arg, text in zip(record.values, record.args_str):
+            self._encode_arg(defs, out, arg, text)
+
+        if record.exception is not None and exceptions:
+            data = record.traceback_text.encode('utf-8', 'surrogateescape')
+            out.append(b'X' + _U32.pack(len(data)) + data)
+
+        return b''.join(defs + out) if defs else b''.join(out)
+
+class BinaryHandler(LoggerHandler):
+    """Writes records into the binary stream without formatting.
+       Strings (formatters, names, messages) and call sites are written once per stream
+       and referenced by ids. Arguments are stored raw (objects of not basic types as their ``str()``)
+
+       Stream is buffered by ``buffer_size`` bytes and flushed by records of the ``flush_level``
+       (or higher), after ``flush_interval`` and at exit
+
+       Messages should be templates (``'User {}'``, not f-strings): every distinct message is a new
+       call site. When ``max_definitions`` strings and call sites are defined, the handler starts a new
+       session of the stream (writes the magic and defines them again), so its memory stays bounded.
+
+       Handler doesn't write rendered text, so it can't be wrapped by :class:`ezlog.handlers.QueueHandler`,
+       :class:`ezlog.aio.AsyncioHandler` or used by :class:`ezlog.multiprocess.LogAggregator`
+
+    :ivar path: Path to the file
+    :type path: PathLike[str] | str
+    """
+
+    writes_text = False
+
+    def __init__(self,
+                 path: PathLike[str] | str,
+                 mode: str = 'w',
+                 max_definitions: int = 1 << 16,
+                 **kwargs: typing.Any):
+        """
+        :param path: Path to the file
+        :type path: PathLike[str] | str
+        :param mode: Mode of the file opening (``w`` - overwrite, ``a`` - append)
+        :type mode: str
+        :param max_definitions: Max count of the strings and call sites of one session
+        :type max_definitions: int
+        :param kwargs: Key=value parameters for the LoggerHandler
+        :type kwargs: typing.Any
+        """
+
+        kwargs.setdefault('buffer_size', 1 << 16)
+
+        super().__init__(open(path, mode.replace('b', '') + 'b', buffering=max(kwargs['buffer_size'], 1)),
+                         **kwargs)
+
+        self.path = path
+
+        self._encoder     = _RecordEncoder(max_definitions)
+        self._write_lock  = threading.Lock()
+
+        self.io.write(MAGIC)
+
+    @property
+    def max_definitions(self) -> int:
+        """Max count of the strings and call sites of one session"""
+        return self._encoder.max_definitions
+
+    @max_definitions.setter
+    def max_definitions(self, max_definitions: int):
+        self._encoder.max_definitions = max_definitions
+
+    def _write_data(self, data: bytes, level: int):
+        """Writes encoded records into the stream (must be called with acquired lock)"""
+
+        if self.metrics is None:
+            self.io.write(data)
+        else:
+            started = time.perf_counter_ns()
+            self.io.write(data)
+            self.metrics.add_write(len(data), time.perf_counter_ns() - started)
+
+        if self.buffer_size <= 0 or level >= self.flush_level:
+            self.io.flush()
+        elif self._flush_deadline is None and self.flush_interval is not None:
+            self._flush_deadline = time.monotonic() + self.flush_interval
+            _flusher.wakeup()
+
+    def emit(self, record: 'LogRecord'):
+        """Encodes record and writes it into the stream
+
+        :param record: Record to write
+        :type record: LogRecord
+        """
+
+        with self._write_lock:
+            self._write_data(self._encoder.encode(record, self.exceptions), record.level)
+
+    def emit_many(self, records: list['LogRecord']):
+        """Encodes records of the batch and writes them into the stream by one write
+
+        :param records: Records to write
+        :type records: list[LogRecord]
+        """
+
+        with self._write_lock:
+            self._write_data(b''.join([self._encoder.encode(r, self.exceptions) for r in records]),
+                             max(r.level for r in records))
+
+    def handle(self, text: str, level: int):
+        """Binary stream can't store rendered text
+
+        :raises TypeError: Always
+        """
+        raise TypeError('BinaryHandler can\'t write rendered text, records must be passed by emit()')
+
+    def write(self, text: str):
+        """Binary stream can't store rendered text
+
+        :raises TypeError: Always
+        """
+        raise TypeError('BinaryHandler can\'t write rendered text, records must be passed by emit()')
+
+    def flush(self):
+        """Flushes the stream"""
+
+        with self._write_lock:
+            self._flush_deadline = None
+
+            if not self.io.closed:
+                self.io.flush()
+
+
+class CallSite:
+    """Call site of the binary stream (static part of the records)"""
+
+    __slots__ = ('formatter', 'time_formatter', 'group_name', 'name', 'message', 'caller')
+
+    def __init__(self, formatter: str, time_formatter: str, group_name: str, name: str, message: str,
+                 caller: '_DecodedCaller'):
+        self.formatter       = formatter
+        self.time_formatter  = time_formatter
+        self.group_name      = group_name
+        self.name            = name
+        self.message         = message
+        self.caller          = caller
+
+
+class _DecodedCaller:
+    """Caller information of the decoded call site (compatible with :class:`ezlog.utils.CallerInfo`)"""
+
+    __slots__ = ('filename', 'lineno', 'function')
+
+    code_context  = None
+    index         = None
+
+    def __init__(self, filename: str, lineno: int, function: str):
+        self.filename  = filename
+        self.lineno    = lineno
+        self.function  = function
+
+
+class OpaqueArg:
+    """Argument of not basic type, decoded from the stream. ``str()`` returns saved text
+
+    :ivar type_name: Full name of the original type
+    :type type_name: str
+    :ivar text: ``str()`` of the original object
+    :type text: str
+    """
+
+    __slots__ = ('type_name', 'text')
+
+    def __init__(self, type_name: str, text: str):
+        self.type_name  = type_name
+        self.text       = text
+
+    def __str__(self):
+        return self.text
+
+
+class BinaryRecord:
+    """Record, decoded from the binary stream
+
+    :ivar site: Call site of the record
+    :type site: CallSite
+    :ivar timestamp: Time of the record in nanoseconds since epoch
+    :type timestamp: int
+    :ivar level: Level of the record
+    :type level: int
+    :ivar args: Decoded arguments
+    :type args: list
+    :ivar traceback: Formatted traceback (if exception was logged)
+    :type traceback: str | None
+    """
+
+    __slots__ = ('site', 'timestamp', 'level', 'args', 'traceback')
+
+    def __init__(self, site: CallSite, timestamp: int, level: int, args: list):
+        self.site       = site
+        self.timestamp  = timestamp
+        self.level      = level
+        self.args       = args
+        self.traceback  = None
+
+
+def _read_exact(stream: typing.BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+
+    if len(data) != size:
+        raise EOFError('Unexpected end of the binary log')
+
+    return data
+
+
+def _read_arg(stream: typing.BinaryIO, strings: dict[int, str]) -> typing.Any:
+    tag = _read_exact(stream, 1)
+
+    if tag == b'n':
+        return None
+    if tag == b'T':
+        return True
+    if tag == b'F':
+        return False
+    if tag == b'i':
+        return _I64.unpack(_read_exact(stream, 8))[0]
+    if tag == b'f':
+        return _F64.unpack(_read_exact(stream, 8))[0]
+
+    if tag == b'o':
+        type_name = strings[_U32.unpack(_read_exact(stream, 4))[0]]
+    else:
+        type_name = None
+
+    data = _read_exact(stream, _U32.unpack(_read_exact(stream, 4))[0])
+
+    if tag == b'y':
+        return data
+    if tag == b'I':
+        return int(data)
+    if tag == b's':
+        return data.decode('utf-8', 'surrogateescape')
+    if tag == b'o':
+        return OpaqueArg(type_name, data.decode('utf-8', 'surrogateescape'))
+
+    raise ValueError(f'Unknown argument tag {tag!r}')
+
+
+class _FrameReader:
+    """Reads frames of the binary stream. Keeps strings and call sites of the current session,
+       so frames of one stream can be read by parts (see :class:`ezlog.multiprocess.LogAggregator`)
+    """
+
+    def __init__(self):
+        self.strings  = {}
+        self.sites    = {}
+
+    def read(self, stream: typing.BinaryIO) -> typing.Iterator[BinaryRecord]:
+        """Reads records until the end of the stream
+
+        :param stream: Frames of the binary stream
+        :type stream: BinaryIO
+
+        :returns: Iterator over the records (traceback is attached to the record, before it is yielded)
+        :raises ValueError: When stream is corrupted
+        """
+
+        pending = None
+
+        while True:
+            tag = stream.read(1)
+
+            if tag != b'X' and pending is not None:
+                yield pending
+                pending = None
+
+            if not tag:
+                return
+
+            if tag == b'R':
+                _, site_id, timestamp, level, argc = _RECORD.unpack(tag + _read_exact(stream, _RECORD.size - 1))
+                pending = BinaryRecord(self.sites[site_id], timestamp, level,
+                                       [_read_arg(stream, self.strings) for _ in range(argc)])
+
+            elif tag == b'S':
+                _, string_id, size = _STRING.unpack(tag + _read_exact(stream, _STRING.size - 1))
+                self.strings[string_id] = _read_exact(stream, size).decode('utf-8', 'surrogateescape')
+
+            elif tag == b'C':
+                _, site_id, lineno, *ids = _SITE.unpack(tag + _read_exact(stream, _SITE.size - 1))
+                formatter, time_formatter, group_name, name, message, filename, function = \
+                    [self.strings[i] for i in ids]
+
+                self.sites[site_id] = CallSite(formatter, time_formatter, group_name, name, message,
+                                               _DecodedCaller(filename, lineno, function))
+
+            elif tag == b'X':
+                size, = _U32.unpack(_read_exact(stream, 4))
+                pending.traceback = _read_exact(stream, size).decode('utf-8', 'surrogateescape')
+
+            elif tag == MAGIC[:1]:
+                # new session of the appended stream
+                if _read_exact(stream, len(MAGIC) - 1) != MAGIC[1:]:
+                    raise ValueError('Corrupted ezlog binary log')
+
+                self.strings, self.sites = {}, {}
+
+            else:
+                raise ValueError(f'Unknown frame tag {tag!r}')
+
+
+def read_records(stream: typing.BinaryIO) -> typing.Iterator[BinaryRecord]:
+    """Reads records from the binary stream
+
+    :param stream: Binary stream (opened file)
+    :type stream: BinaryIO
+
+    :returns: Iterator over the records (traceback is attached to the record, before it is yielded)
+    :raises ValueError: When stream isn't ezlog binary log
+    """
+
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Stream is not an ezlog binary log')
+
+    yield from _FrameReader().read(stream)
@@ -0,0 +1,193 @@
+"""
+Decoder of the binary logs (see :mod:`ezlog.binary`). Renders records into the text,
+as the text handlers do it.
+
+Usage::
+
+    python -m ezlog.decode app.ezlb [more.ezlb ...] [--colors | --no-colors] [-o output.log]
+"""
+
+import argparse
+import builtins
+import sys
+import typing
+
+from .binary import BinaryRecord, OpaqueArg, read_records
+from .defaults import DEFAULT_COLOR_SET
+from .logger import Logger, reset
+from .record import LogRecord
+from .utils import ColorMap, type_to_color
+from ._types import ColorSetType
+
+__all__ = ['BinaryDecoder', 'main']
+
+
+class _DecodedGroup:
+    """Stub of the logger group (only its full name is known)"""
+
+    __slots__ = ('group_link',)
+
+    def __init__(self, group_link: str):
+        self.group_link = group_link
+
+
+class _DecodingLogger(Logger):
+    """Logger, that renders decoded records. Exception of the record is a formatted traceback"""
+
+    def render_exception(self, record: LogRecord, colors: bool) -> str:
+        exception_color = type_to_color('exception', self.color_set) if colors else ''
+
+        return exception_color + record.exception + reset + '\n'
+
+
+class BinaryDecoder:
+    """Renders records of the binary logs
+
+    :ivar color_set: Color set of the colored output
+    :type color_set: ColorSetType
+    """
+
+    def __init__(self, color_set: ColorSetType | None = None):
+        """
+        :param color_set: Color set of the colored output (copy of the ``DEFAULT_COLOR_SET`` by default)
+        :type color_set: ColorSetType | None
+        """
+
+        source = color_set if color_set is not None else DEFAULT_COLOR_SET
+
+        # types of the opaque arguments are added to the copy
+        self.color_set = {'level': source['level'], 'types': ColorMap(source['types'])}
+
+        self._loggers       = {}
+        self._opaque_types  = {}
+
+    def _logger(self, record: BinaryRecord) -> Logger:
+        site = record.site
+        key  = (site.name, site.group_name, site.formatter, site.time_formatter)
+
+        logger = self._loggers.get(key)
+
+        if logger is None:
+            logger = self._loggers[key] = _DecodingLogger(site.name, formatter=site.formatter,
+                                                          time_formatter=site.time_formatter,
+                                                          color_set=self.color_set)
+
+            # loggers without group are rendered with the "ezlog" group name too
+            if site.group_name != 'ezlog':
+                logger.group = _DecodedGroup(site.group_name)
+
+        return logger
+
+    def _opaque_type(self, type_name: str) -> type:
+        """Returns type for the opaque argument, colored as the original type (if it can be found)
+
+        :param type_name: Full name of the original type
+        :type type_name: str
+        """
+
+        cls = self._opaque_types.get(type_name)
+
+        if cls is None:
+            cls = self._opaque_types[type_name] = type(type_name.rpartition('.')[2], (OpaqueArg,), {'__slots__': ()})
+
+            # only already imported modules are looked up (decoding must not run foreign code)
+            module_name, _, qualname = type_name.rpartition('.')
+            module = builtins if module_name == 'builtins' else sys.modules.get(module_name)
+            original = getattr(module, qualname, None) if module is not None else None
+
+            self.color_set['types'][cls] = type_to_color(original if isinstance(original, type) else 'all',
+                                                         self.color_set)
+
+        return cls
+
+    def record(self, record: BinaryRecord) -> LogRecord:
+        """Makes record, that can be rendered by the handlers. Its exception is the formatted traceback
+
+        :param record: Decoded record
+        :type record: BinaryRecord
+
+        :returns: Record of the decoding logger
+        :rtype: LogRecord
+        """
+
+        args = tuple(self._opaque_type(a.type_name)(a.type_name, a.text) if isinstance(a, OpaqueArg) else a
+                     for a in record.args)
+
+        log_record = LogRecord(self._logger(record), record.level, record.timestamp,
+                               record.site.message, args, record.site.caller, record.traceback)
+
+        if record.traceback is not None:
+            log_record._cache['traceback'] = record.traceback
+
+        return log_record
+
+    def render(self, record: BinaryRecord, colors: bool = False) -> str:
+        """Renders decoded record
+
+        :param record: Decoded record
+        :type record: BinaryRecord
+        :param colors: Render colored variant
+        :type colors: bool
+
+        :returns: Rendered record with the line end
+        :rtype: str
+        """
+        return self.record(record).render(colors)
+
+    def decode(self, stream: typing.BinaryIO, colors: bool = False) -> typing.Iterator[str]:
+        """Renders all records of the binary stream
+
+        :param stream: Binary stream
+        :type stream: BinaryIO
+        :param colors: Render colored variant
+        :type colors: bool
+
+        :returns: Iterator over the rendered records
+        """
+
+        for record in read_records(stream):
+            yield self.render(record, colors)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the ``python -m ezlog.decode``
+
+    :param argv: Command line arguments
+    :type argv: list[str] | None
+
+    :returns: Exit code
+    :rtype: int
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m ezlog.decode', description='Renders ezlog binary logs into text')
+    parser.add_argument('files', nargs='+', help='binary log files')
+    parser.add_argument('--colors', action=argparse.BooleanOptionalAction, default=None,
+                        help='render colored records (by default, if output is a terminal)')
+    parser.add_argument('-o', '--output', help='output file (stdout by default)')
+
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    colors = args.colors if args.colors is not None else (args.output is None and sys.stdout.isatty())
+
+    decoder = BinaryDecoder()
+
+    try:
+        for path in args.files:
+            with open(path, 'rb') as stream:
+                for text in decoder.decode(stream, colors):
+                    output.write(text)
+
+    except (ValueError, EOFError) as e:
+        print(f'{parser.prog}: error: {e}', file=sys.stderr)
+        return 1
+
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,35 +2,34 @@
 Defines default variables, such as a color set
 """
 
-import colorama
-
 from ._types import ColorSetType
-from .utils import LogLevel
+from .utils import LogLevel, ColorMap
+from ._ansi import Fore, Style
 
 __all__ = ['DEFAULT_COLOR_SET', 'DEFAULT_FORMATTER', 'DEFAULT_TIME_FORMATTER']
 
 # default color set
 DEFAULT_COLOR_SET: ColorSetType = {
     'level': {
-        LogLevel.DEBUG:      colorama.Fore.LIGHTWHITE_EX,
-        LogLevel.EXCEPTION:  colorama.Fore.LIGHTYELLOW_EX,
-        LogLevel.INFO:       colorama.Fore.LIGHTCYAN_EX,
-        LogLevel.WARNING:    colorama.Fore.YELLOW,
-        LogLevel.ERROR:      colorama.Fore.LIGHTRED_EX,
-        LogLevel.CRITICAL:   colorama.Fore.RED
+        LogLevel.DEBUG:      Fore.LIGHTWHITE_EX,
+        LogLevel.EXCEPTION:  Fore.LIGHTYELLOW_EX,
+        LogLevel.INFO:       Fore.LIGHTCYAN_EX,
+        LogLevel.WARNING:    Fore.YELLOW,
+        LogLevel.ERROR:      Fore.LIGHTRED_EX,
+        LogLevel.CRITICAL:   Fore.RED
     },
-    'types': {
-        int:          colorama.Fore.LIGHTCYAN_EX + colorama.Style.BRIGHT,
-        float:        colorama.Fore.LIGHTCYAN_EX,
-        bool:         colorama.Fore.YELLOW,
-        str:          colorama.Fore.LIGHTMAGENTA_EX + colorama.Style.BRIGHT,
-        bytes:        colorama.Fore.LIGHTMAGENTA_EX,
-        list:         colorama.Fore.LIGHTYELLOW_EX + colorama.Style.BRIGHT,
-        tuple:        colorama.Fore.MAGENTA,
-        Exception:    colorama.Fore.LIGHTRED_EX,
-        'exception':  colorama.Fore.LIGHTRED_EX,
-        'all':        colorama.Fore.LIGHTGREEN_EX + colorama.Style.BRIGHT
-    }
+    'types': ColorMap({
+        int:          Fore.LIGHTCYAN_EX + Style.BRIGHT,
+        float:        Fore.LIGHTCYAN_EX,
+        bool:         Fore.YELLOW,
+        str:          Fore.LIGHTMAGENTA_EX + Style.BRIGHT,
+        bytes:        Fore.LIGHTMAGENTA_EX,
+        list:         Fore.LIGHTYELLOW_EX + Style.BRIGHT,
+        tuple:        Fore.MAGENTA,
+        Exception:    Fore.LIGHTRED_EX,
+        'exception':  Fore.LIGHTRED_EX,
+        'all':        Fore.LIGHTGREEN_EX + Style.BRIGHT
+    })
 }
 """Default color set"""
 
@@ -2,25 +2,118 @@
 Defines main ezlog handlers
 """
 
+import atexit
+import collections
+import os
 import sys
+import threading
+import time
 import typing
+import weakref
 from os import PathLike
 from typing import TextIO
 
-from .utils import LogLevel, level_names
+from .utils import LogLevel, ConfigGeneration, name_to_level, rotated_segments
 from ._types import LogLevelType
 
-__all__ = ['LoggerHandler', 'FileHandler', 'StdoutHandler', 'StderrHandler',]
+if typing.TYPE_CHECKING:
+    from .record import LogRecord
+    from .metrics import Metrics
+
+__all__ = ['LoggerHandler', 'HandlerList', 'QueueHandler', 'FileHandler', 'RotatingFileHandler', 'StdoutHandler', 'StderrHandler',]
+
+# max count of the buffers of one os.writev
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+
+if _IOV_MAX <= 0:
+    _IOV_MAX = 16
+
+
+def _write_all(fd: int, views: list[memoryview]):
+    """Writes all buffers into the file descriptor. Buffers are written by ``os.writev`` (by ``IOV_MAX`` buffers),
+       or by one ``os.write``, if ``writev`` isn't available. Partial writes are continued
+    """
+
+    if len(views) == 1 or not hasattr(os, 'writev'):
+        view = views[0] if len(views) == 1 else memoryview(b''.join(views))
+
+        while view:
+            view = view[os.write(fd, view):]
+
+        return
+
+    views  = [v for v in views if v]
+    start  = 0
+
+    while start < len(views):
+        written = os.writev(fd, views[start:start + _IOV_MAX])
+
+        # skip written buffers, the rest of the partially written one is written by the next call
+        while written:
+            size = len(views[start])
+
+            if written >= size:
+                written  -= size
+                start    += 1
+            else:
+                views[start]  = views[start][written:]
+                written       = 0
+
+
+class _ThreadBuffer:
+    """Buffer of the records of one thread. Its lock is taken only by the owner thread
+       and by the flush, so threads don't contend with each other
+    """
+
+    __slots__ = ('lock', 'items', 'size', 'thread')
+
+    def __init__(self):
+        self.lock    = threading.Lock()
+        self.items   = []
+        self.size    = 0
+        self.thread  = threading.current_thread()
+
+    def take(self) -> list:
+        """Takes all buffered records (must be called with acquired lock)"""
+
+        items = self.items
+
+        self.items  = []
+        self.size   = 0
+
+        return items
 
 
 class LoggerHandler:
-    """Handler for any IO"""
+    """Handler for any IO.
+       By default, every record is written and flushed immediately. If ``buffer_size`` is set, records
+       are collected into the buffer and written by one call when the buffer is full, when ``flush_interval``
+       passed since the first buffered record or when record of the ``flush_level`` (or higher) comes.
+       Buffered handlers are also flushed at interpreter exit
+
+       Handler is thread-safe: every record (with its traceback) is written by one locked write.
+       In the buffered mode every thread has its own buffer, buffers are merged into the IO in batches,
+       so records of one thread keep their order, but records of different threads are grouped by threads.
+       Buffers of all threads together are also bounded by ``buffer_size`` (all of them are flushed,
+       when it is reached), buffers of the finished threads are written, when a new thread logs
+    """
+
+    writes_text = True
+    """Handler writes rendered text (accepts it by :meth:`handle`), so it can be wrapped
+       by :class:`QueueHandler` and used by :class:`ezlog.multiprocess.LogAggregator`"""
 
     def __init__(self,
                  io: TextIO | None = None,
                  log_level: LogLevelType = LogLevel.NOTSET,
                  colors: bool = True,
-                 exceptions: bool = True):
+                 exceptions: bool = True,
+                 buffer_size: int = 0,
+                 flush_interval: float | None = None,
+                 flush_level: LogLevelType = LogLevel.ERROR,
+                 metrics: typing.Optional['Metrics'] = None):
         """
         :param io: TextIO to handle
         :type io: TextIO
@@ -30,12 +123,226 @@ class LoggerHandler:
         :type colors: bool
         :param exceptions: Enable exception handling for this handler
         :type exceptions: bool
+        :param buffer_size: Size of the buffer in characters (0 disables buffering)
+        :type buffer_size: int
+        :param flush_interval: Max time in seconds, that record can stay in the buffer (None is unlimited)
+        :type flush_interval: float | None
+        :param flush_level: Records of this level (or higher) flush the buffer immediately
+        :type flush_level: LogLevelType
+        :param metrics: Counters of the handler (see :class:`ezlog.metrics.Metrics`)
+        :type metrics: Metrics | None
+        """
+
+        self.io              = io
+        self.log_level       = log_level
+        self.colors          = colors
+        self.exceptions      = exceptions
+        self.buffer_size     = buffer_size
+        self.flush_interval  = flush_interval
+        self.flush_level     = name_to_level(flush_level)
+        self.metrics         = metrics
+
+        # lock of the writes and buffers of the threads
+        self._lock            = threading.Lock()
+        self._local           = threading.local()
+        self._buffers         = []
+        self._buffered        = 0
+        self._flush_deadline  = None
+
+        if self.buffer_size > 0:
+            _flusher.register(self)
+
+    @property
+    def log_level(self) -> int:
+        """Level of logging. Changing of it updates precomputed levels of the loggers"""
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self, log_level: LogLevelType):
+        self._log_level = name_to_level(log_level)
+        ConfigGeneration.bump()
+
+    @property
+    def colors(self) -> bool:
+        """Colors of the handler. Changing of it updates the message variants rendered by the loggers"""
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors: bool):
+        self._colors = colors
+        ConfigGeneration.bump()
+
+    def format(self, record: 'LogRecord') -> str:
+        """Renders record into the text, that is written by the handler
+
+        :param record: Record to render
+        :type record: LogRecord
+
+        :returns: Rendered record with the line end
+        :rtype: str
+        """
+        return record.render(self.colors, self.exceptions)
+
+    def emit(self, record: 'LogRecord'):
+        """Handles record from the logger. Text handlers render it with the handler settings
+           (rendered text is shared with other handlers with the same settings)
+
+        :param record: Record to handle
+        :type record: LogRecord
         """
 
-        self.io          = io
-        self.log_level   = log_level if isinstance(log_level, int) else {v: k for k, v in level_names.items()}[log_level.upper()]
-        self.colors      = colors
-        self.exceptions  = exceptions
+        if self.metrics is None:
+            self.handle(record.render(self.colors, self.exceptions), record.level)
+            return
+
+        started  = time.perf_counter_ns()
+        text     = record.render(self.colors, self.exceptions)
+        self.metrics.add_format(time.perf_counter_ns() - started)
+
+        self.handle(text, record.level)
+
+    def emit_many(self, records: list['LogRecord']):
+        """Handles records of the batch (see :meth:`ezlog.logger.Logger.batch`). Rendered records
+           are handled as one text (with the highest level of the records), so they are written by one write
+
+        :param records: Records to handle
+        :type records: list[LogRecord]
+        """
+
+        level = max(r.level for r in records)
+
+        if self.metrics is None:
+            self.handle(''.join([self.format(r) for r in records]), level)
+            return
+
+        started  = time.perf_counter_ns()
+        text     = ''.join([self.format(r) for r in records])
+        self.metrics.add_format(time.perf_counter_ns() - started)
+
+        self.handle(text, level)
+
+    def handle(self, text: str, level: int):
+        """Handles rendered record (text with the message and the exception, if any).
+           Writes it or puts to the buffer, if buffering is enabled
+
+        :param text: Rendered record
+        :type text: str
+        :param level: Level of the record
+        :type level: int
+        """
+
+        if self.buffer_size <= 0:
+            with self._lock:
+                if self.metrics is None:
+                    self.write(text)
+                else:
+                    self._measured_write(text)
+            return
+
+        items = self._buffer([text], len(text), level)
+
+        if items is not None:
+            # buffer of the thread is merged by one write
+            with self._lock:
+                self._write_batch(''.join(items))
+
+    def _buffer(self, items: list, size: int, level: int) -> list | None:
+        """Puts items into the buffer of the current thread
+
+        :returns: Buffered items, if the buffer must be written now (None otherwise)
+        """
+
+        buffer = getattr(self._local, 'buffer', None)
+
+        if buffer is None:
+            buffer = self._thread_buffer()
+
+        with buffer.lock:
+            buffer.items.extend(items)
+            buffer.size += size
+
+            if buffer.size >= self.buffer_size or level >= self.flush_level:
+                self._buffered -= buffer.size - size
+                return buffer.take()
+
+            if self._flush_deadline is None and self.flush_interval is not None:
+                self._flush_deadline = time.monotonic() + self.flush_interval
+                _flusher.wakeup()
+
+            # size of all buffers (approximate: it is changed without the lock of the handler)
+            self._buffered += size
+
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+        return None
+
+    def _thread_buffer(self) -> _ThreadBuffer:
+        """Creates buffer of the current thread"""
+
+        buffer = self._local.buffer = _ThreadBuffer()
+
+        with self._lock:
+            alive  = [b for b in self._buffers if b.thread.is_alive()]
+
+            # records of the finished threads are written now, not at the next flush (it drops their buffers)
+            flush  = any(b.items for b in self._buffers if not b.thread.is_alive())
+
+            if not flush:
+                self._buffers = alive
+
+            self._buffers.append(buffer)
+
+        if flush:
+            self.flush()
+
+        return buffer
+
+    def flush(self):
+        """Writes buffered records of all threads to the IO"""
+
+        with self._lock:
+            items = self._take_buffers()
+
+            if items:
+                self._write_batch(''.join(items))
+
+    def _take_buffers(self) -> list:
+        """Takes items of the buffers of all threads (must be called with acquired lock)"""
+
+        self._flush_deadline  = None
+        self._buffered        = 0
+
+        items = []
+
+        for buffer in self._buffers:
+            with buffer.lock:
+                if buffer.items:
+                    items.extend(buffer.take())
+
+        # buffers of the finished threads are empty now
+        self._buffers = [b for b in self._buffers if b.thread.is_alive()]
+
+        return items
+
+    def _write_batch(self, text: str):
+        # must be called with acquired lock
+        if self.metrics is None:
+            self.write(text)
+            return
+
+        self.metrics.count_flush()
+        self._measured_write(text)
+
+    def _measured_write(self, text: str):
+        """Writes text and counts it in the metrics"""
+
+        started = time.perf_counter_ns()
+        self.write(text)
+        elapsed = time.perf_counter_ns() - started
+
+        # size in UTF-8 bytes (encoding is skipped for ASCII text)
+        self.metrics.add_write(len(text) if text.isascii() else len(text.encode('utf-8', 'surrogateescape')), elapsed)
 
     def write(self, text: str):
         """Writes given text to the IO if it doesn't equal to None
@@ -49,23 +356,534 @@ class LoggerHandler:
         self.io.write(text)
         self.io.flush()
 
+    def close(self):
+        """Flushes the buffer and closes the IO"""
+
+        self.flush()
+
+        if self.io is not None:
+            self.io.close()
+
     def __del__(self):
-        self.io.close()
+        # initialization of the handler failed
+        if '_lock' not in self.__dict__:
+            return
+
+        self.close()
+
+
+def _report_error(message: str):
+    """Prints the handled exception of the background writer to the stderr (writer keeps working)"""
+
+    import traceback
+
+    try:
+        sys.stderr.write(f'--- ezlog: error in the background writer, {message} ---\n' + traceback.format_exc())
+    except Exception:
+        pass
+
+
+class _BufferFlusher:
+    """Background thread, that flushes buffered handlers after their ``flush_interval``"""
+
+    def __init__(self):
+        self.handlers  = weakref.WeakSet()
+        self.event     = threading.Event()
+        self.thread    = None
+        self.lock      = threading.Lock()
+
+    def register(self, handler: LoggerHandler):
+        """Registers buffered handler (to flush it by interval and at exit)
+
+        :param handler: Buffered handler
+        :type handler: LoggerHandler
+        """
 
+        with self.lock:
+            self.handlers.add(handler)
 
-class FileHandler(LoggerHandler):
-    """Handle file for logging
+    def wakeup(self):
+        """Wakes up the thread to recalculate the nearest flush time"""
+
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, name='ezlog-flusher', daemon=True)
+                    self.thread.start()
+
+        self.event.set()
+
+    def run(self):
+        while True:
+            self.event.clear()
+
+            timeout  = None
+            now      = time.monotonic()
+
+            for handler in list(self.handlers):
+                deadline = handler._flush_deadline
+
+                if deadline is None:
+                    continue
+
+                if deadline <= now:
+                    handler.flush()
+                elif timeout is None or deadline - now < timeout:
+                    timeout = deadline - now
+
+            self.event.wait(timeout)
+
+    def flush_all(self):
+        """Flushes all buffered handlers"""
+
+        for handler in list(self.handlers):
+            handler.flush()
+
+
+_flusher = _BufferFlusher()
+atexit.register(_flusher.flush_all)
+
+
+class HandlerList(list):
+    """List of the handlers, that notifies loggers about its changes.
+       Used by :class:`ezlog.logger.Logger` and :class:`ezlog.loggergroup.LoggerGroup` to store handlers
+    """
+
+    def _changed(method):
+        def f(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            ConfigGeneration.bump()
+            return result
+
+        f.__name__ = method.__name__
+        f.__doc__ = method.__doc__
+        return f
+
+    append       = _changed(list.append)
+    extend       = _changed(list.extend)
+    insert       = _changed(list.insert)
+    remove       = _changed(list.remove)
+    pop          = _changed(list.pop)
+    clear        = _changed(list.clear)
+    sort         = _changed(list.sort)
+    reverse      = _changed(list.reverse)
+    __setitem__  = _changed(list.__setitem__)
+    __delitem__  = _changed(list.__delitem__)
+    __iadd__     = _changed(list.__iadd__)
+    __imul__     = _changed(list.__imul__)
+
+    del _changed
+
+
+class _WrapperHandler(LoggerHandler):
+    """Base of the handlers, that pass rendered records to another handler.
+       Records are rendered by the wrapped handler (:meth:`LoggerHandler.format`), so its output format
+       (e.g. JSON Lines) is kept. Parameters ``log_level``, ``colors``, ``exceptions`` and ``metrics``
+       are taken from the wrapped handler
+
+    :ivar handler: Wrapped handler
+    :type handler: LoggerHandler
+    """
+
+    def __init__(self, handler: LoggerHandler):
+        """
+        :param handler: Handler to wrap
+        :type handler: LoggerHandler
+
+        :raises TypeError: When handler doesn't write rendered text
+        """
+
+        if not handler.writes_text:
+            raise TypeError(f'{type(handler).__name__} doesn\'t write rendered text, so it can\'t be wrapped')
+
+        self.handler = handler
+
+        super().__init__(None, log_level=handler.log_level, colors=handler.colors, exceptions=handler.exceptions,
+                         metrics=handler.metrics)
+
+    @property
+    def log_level(self) -> int:
+        """Level of logging of the wrapped handler"""
+        return self.handler.log_level
+
+    @log_level.setter
+    def log_level(self, log_level: LogLevelType):
+        self.handler.log_level = log_level
+
+    @property
+    def colors(self) -> bool:
+        """Colors of the wrapped handler"""
+        return self.handler.colors
+
+    @colors.setter
+    def colors(self, colors: bool):
+        self.handler.colors = colors
+
+    @property
+    def exceptions(self) -> bool:
+        """Exception handling of the wrapped handler"""
+        return self.handler.exceptions
+
+    @exceptions.setter
+    def exceptions(self, exceptions: bool):
+        self.handler.exceptions = exceptions
+
+    @property
+    def metrics(self) -> 'Metrics | None':
+        """Counters of the wrapped handler"""
+        return self.handler.metrics
+
+    @metrics.setter
+    def metrics(self, metrics: 'Metrics | None'):
+        self.handler.metrics = metrics
+
+    def format(self, record: 'LogRecord') -> str:
+        """Renders record by the wrapped handler
+
+        :param record: Record to render
+        :type record: LogRecord
+
+        :returns: Rendered record with the line end
+        :rtype: str
+        """
+        return self.handler.format(record)
+
+    def emit(self, record: 'LogRecord'):
+        """Renders record by the wrapped handler and handles the text
+
+        :param record: Record to handle
+        :type record: LogRecord
+        """
+
+        if self.metrics is None:
+            self.handle(self.handler.format(record), record.level)
+            return
+
+        started  = time.perf_counter_ns()
+        text     = self.handler.format(record)
+        self.metrics.add_format(time.perf_counter_ns() - started)
+
+        self.handle(text, record.level)
+
+    def write(self, text: str):
+        """Writes given text directly to the wrapped handler
+
+        :param text: Text to write
+        :type text: str
+        """
+        self.handler.write(text)
+
+
+class QueueHandler(_WrapperHandler):
+    """Wraps a handler and writes records to it from the background thread,
+       so the logging thread isn't blocked by the slow IO.
+       Queue is bounded by ``max_size`` records. When it is full, ``overflow`` policy is applied:
+
+       * ``block`` - wait until writer thread takes records from the queue
+       * ``drop_newest`` - drop the incoming record
+       * ``drop_oldest`` - drop the oldest record in the queue
+       * ``drop_below_level`` - drop the incoming record if its level is lower than ``drop_level``, otherwise wait
+
+       Records are rendered by the wrapped handler in the logging thread (see :class:`_WrapperHandler`).
+       Queue is drained on :meth:`close` and at interpreter exit
+
+    :ivar handler: Wrapped handler
+    :type handler: LoggerHandler
+    :ivar dropped: Count of the dropped records
+    :type dropped: int
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop_newest', 'drop_oldest', 'drop_below_level')
+
+    def __init__(self,
+                 handler: LoggerHandler,
+                 max_size: int = 10000,
+                 overflow: str = 'block',
+                 drop_level: LogLevelType = LogLevel.ERROR):
+        """
+        :param handler: Handler to wrap
+        :type handler: LoggerHandler
+        :param max_size: Max count of the records in the queue
+        :type max_size: int
+        :param overflow: Policy applied when queue is full (see :attr:`OVERFLOW_POLICIES`)
+        :type overflow: str
+        :param drop_level: Records lower than this level are dropped by ``drop_below_level`` policy
+        :type drop_level: LogLevelType
+
+        :raises ValueError: When overflow policy is unknown
+        :raises TypeError: When handler doesn't write rendered text
+        """
+
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f'Unknown overflow policy "{overflow}"')
+
+        super().__init__(handler)
+
+        self.max_size    = max_size
+        self.overflow    = overflow
+        self.drop_level  = name_to_level(drop_level)
+        self.dropped     = 0
+
+        self._queue      = collections.deque()
+        self._busy       = False
+        self._closed     = False
+        self._stopped    = False
+        self._not_empty  = threading.Condition(self._lock)
+        self._not_full   = threading.Condition(self._lock)
+
+        self._thread = threading.Thread(target=self._run, name='ezlog-queue', daemon=True)
+        self._thread.start()
+
+        _queue_handlers.add(self)
+
+    def handle(self, text: str, level: int):
+        """Puts record to the queue (or applies overflow policy, if queue is full)
+
+        :param text: Rendered record
+        :type text: str
+        :param level: Level of the record
+        :type level: int
+        """
+
+        with self._lock:
+            while len(self._queue) >= self.max_size and not self._stopped:
+                if self.overflow == 'drop_newest' or (self.overflow == 'drop_below_level' and level < self.drop_level):
+                    self.dropped += 1
+
+                    if self.metrics is not None:
+                        self.metrics.count_dropped()
+                    return
+
+                if self.overflow == 'drop_oldest':
+                    self._queue.popleft()
+                    self.dropped += 1
+
+                    if self.metrics is not None:
+                        self.metrics.count_dropped()
+                    break
+
+                self._not_full.wait()
+
+            if self._closed or self._stopped:
+                # writer is stopped, there is nothing to do except the direct write
+                self.handler.handle(text, level)
+                return
+
+            self._queue.append((text, level))
+            self._not_empty.notify()
+
+    def _run(self):
+        try:
+            self._write_queued()
+
+        finally:
+            # waiting threads write records directly
+            with self._lock:
+                self._stopped = True
+                self._not_full.notify_all()
+
+    def _write_queued(self):
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+
+                if not self._queue:
+                    return
+
+                records = list(self._queue)
+                self._queue.clear()
+                self._busy = True
+
+                self._not_full.notify_all()
+
+            try:
+                # all taken records are written by one call
+                self.handler.handle(''.join([r[0] for r in records]), max([r[1] for r in records]))
+
+            except Exception:
+                # writer keeps working, records of the failed write are dropped
+                _report_error(f'{len(records)} record(s) of the {type(self).__name__} are dropped')
+
+                with self._lock:
+                    self.dropped += len(records)
+
+                if self.metrics is not None:
+                    for _ in records:
+                        self.metrics.count_dropped()
+
+            finally:
+                with self._lock:
+                    self._busy = False
+                    self._not_full.notify_all()
+
+    def flush(self):
+        """Waits until all queued records are written and flushes the wrapped handler"""
+
+        with self._lock:
+            while (self._queue or self._busy) and not self._stopped:
+                self._not_full.wait()
+
+        self.handler.flush()
+
+    def close(self):
+        """Drains the queue, stops the writer thread and closes the wrapped handler"""
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._not_empty.notify()
+
+        self._thread.join()
+        self.handler.close()
+
+
+def _close_queue_handlers():
+    for handler in list(_queue_handlers):
+        handler.close()
+
+
+_queue_handlers = weakref.WeakSet()
+atexit.register(_close_queue_handlers)
+
+
+class _RawHandler(LoggerHandler):
+    """Handler, that can write bytes directly into the file descriptor of its IO (``raw`` mode).
+       Rendered record is encoded into UTF-8 once and shared by all raw handlers with the same settings
+       (see :meth:`ezlog.record.LogRecord.render_bytes`). Buffered records and batches are written
+       by one ``os.writev``. If IO hasn't file descriptor, handler works in the text mode
+
+    :ivar raw: Raw mode is enabled
+    :type raw: bool
+    """
+
+    def __init__(self, io: TextIO | typing.BinaryIO | None = None, raw: bool = False, **kwargs: typing.Any):
+        super().__init__(io, **kwargs)
+
+        self.raw  = raw
+        self._fd  = self._fileno() if raw else None
+
+    def _fileno(self) -> int | None:
+        """Returns file descriptor of the IO (None if there is no one)"""
+
+        try:
+            return self.io.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def emit(self, record: 'LogRecord'):
+        if self._fd is None:
+            super().emit(record)
+            return
+
+        if self.metrics is None:
+            self._handle_views([record.render_bytes(self.colors, self.exceptions)], record.level)
+            return
+
+        started  = time.perf_counter_ns()
+        view     = record.render_bytes(self.colors, self.exceptions)
+        self.metrics.add_format(time.perf_counter_ns() - started)
+
+        self._handle_views([view], record.level)
+
+    def emit_many(self, records: list['LogRecord']):
+        if self._fd is None:
+            super().emit_many(records)
+            return
+
+        if self.metrics is None:
+            self._handle_views([r.render_bytes(self.colors, self.exceptions) for r in records],
+                               max(r.level for r in records))
+            return
+
+        started  = time.perf_counter_ns()
+        views    = [r.render_bytes(self.colors, self.exceptions) for r in records]
+        self.metrics.add_format(time.perf_counter_ns() - started)
+
+        self._handle_views(views, max(r.level for r in records))
+
+    def handle(self, text: str, level: int):
+        if self._fd is None:
+            super().handle(text, level)
+            return
+
+        self._handle_views([memoryview(text.encode('utf-8', 'surrogateescape'))], level)
+
+    def _handle_views(self, views: list[memoryview], level: int):
+        """Writes encoded records or puts them into the buffer"""
+
+        if self.buffer_size <= 0:
+            with self._lock:
+                self._write_views(views)
+            return
+
+        items = self._buffer(views, sum([len(v) for v in views]), level)
+
+        if items is not None:
+            with self._lock:
+                if self.metrics is not None:
+                    self.metrics.count_flush()
+
+                self._write_views(items)
+
+    def flush(self):
+        if self._fd is None:
+            super().flush()
+            return
+
+        with self._lock:
+            items = self._take_buffers()
+
+            if items:
+                if self.metrics is not None:
+                    self.metrics.count_flush()
+
+                self._write_views(items)
+
+    def write(self, text: str):
+        if self._fd is None:
+            super().write(text)
+            return
+
+        self._write_views([memoryview(text.encode('utf-8', 'surrogateescape'))])
+
+    def _write_views(self, views: list[memoryview]):
+        """Writes encoded records into the file descriptor (must be called with acquired lock)"""
+
+        if self.metrics is None:
+            _write_all(self._fd, views)
+            return
+
+        started = time.perf_counter_ns()
+        _write_all(self._fd, views)
+        self.metrics.add_write(sum([len(v) for v in views]), time.perf_counter_ns() - started)
+
+
+class FileHandler(_RawHandler):
+    """Handle file for logging.
+       In the ``raw`` mode file is opened in the binary unbuffered mode and records are written
+       into its descriptor as UTF-8
 
     :ivar path: Path to the file
     :type path: PathLike[str] | str
+    :ivar mode: Mode of the file opening (``w`` - overwrite, ``a`` - append)
+    :type mode: str
     """
 
     def __init__(self,
                  path: PathLike[str] | str,
+                 mode: str = 'w',
+                 raw: bool = False,
                  **kwargs: typing.Any):
         """
         :param path: Path to the file
         :type path: PathLike[str] | str
+        :param mode: Mode of the file opening (``w`` - overwrite, ``a`` - append to the previous log)
+        :type mode: str
+        :param raw: Write encoded records directly into the file descriptor (see :class:`_RawHandler`)
+        :type raw: bool
         :param kwargs: Key=value parameters for the LoggerHandler
         :type kwargs: typing.Any
 
@@ -79,24 +897,264 @@ class FileHandler(LoggerHandler):
         :type colors: bool
         :param exceptions: Enable exception handling for this handler
         :type exceptions: bool
+        :param buffer_size: Size of the buffer in characters (0 disables buffering)
+        :type buffer_size: int
+        :param flush_interval: Max time in seconds, that record can stay in the buffer (None is unlimited)
+        :type flush_interval: float | None
+        :param flush_level: Records of this level (or higher) flush the buffer immediately
+        :type flush_level: LogLevelType
         """
-        if 'colors' in kwargs:
-            super().__init__(open(path, 'w'), **kwargs)
-        else:
-            super().__init__(open(path, 'w'), colors=False, **kwargs)
+        kwargs.setdefault('colors', False)
 
-        self.path = path
+        super().__init__(self._open(path, mode, raw), raw=raw, **kwargs)
+
+        self.path  = path
+        self.mode  = mode
+
+    @staticmethod
+    def _open(path: PathLike[str] | str, mode: str, raw: bool) -> TextIO | typing.BinaryIO:
+        if raw:
+            return open(path, mode.replace('b', '') + 'b', buffering=0)
+
+        return open(path, mode)
+
+
+class RotatingFileHandler(FileHandler):
+    """Handle file for logging with rotation by size and/or time.
+       Rotated segment is renamed to ``<path>.<YYYYmmdd-HHMMSS>`` and (if enabled) compressed
+       by the background thread, so the logging thread doesn't wait for the compression.
+       Only ``backup_count`` newest segments are kept
+
+    :ivar max_bytes: Max size of the file in bytes (0 disables rotation by size)
+    :type max_bytes: int
+    :ivar interval: Max age of the file in seconds (None disables rotation by time)
+    :type interval: float | None
+    :ivar backup_count: Count of the rotated segments to keep (0 keeps all)
+    :type backup_count: int
+    :ivar compression: Compression of the rotated segments (``gzip``, ``lzma`` or None)
+    :type compression: str | None
+    """
+
+    COMPRESSIONS = {'gzip': '.gz', 'lzma': '.xz'}
+
+    def __init__(self,
+                 path: PathLike[str] | str,
+                 max_bytes: int = 0,
+                 interval: float | None = None,
+                 backup_count: int = 5,
+                 compression: str | None = None,
+                 mode: str = 'a',
+                 **kwargs: typing.Any):
+        """
+        :param path: Path to the file
+        :type path: PathLike[str] | str
+        :param max_bytes: Max size of the file in bytes (0 disables rotation by size)
+        :type max_bytes: int
+        :param interval: Max age of the file in seconds (None disables rotation by time)
+        :type interval: float | None
+        :param backup_count: Count of the rotated segments to keep (0 keeps all)
+        :type backup_count: int
+        :param compression: Compression of the rotated segments (``gzip``, ``lzma`` or None)
+        :type compression: str | None
+        :param mode: Mode of the file opening (by default appends to the previous log)
+        :type mode: str
+        :param kwargs: Key=value parameters for the LoggerHandler (see :class:`FileHandler`)
+        :type kwargs: typing.Any
+
+        :raises ValueError: When compression is unknown
+        """
+
+        if compression is not None and compression not in self.COMPRESSIONS:
+            raise ValueError(f'Unknown compression "{compression}"')
+
+        super().__init__(path, mode=mode, **kwargs)
+
+        self.max_bytes     = max_bytes
+        self.interval      = interval
+        self.backup_count  = backup_count
+        self.compression   = compression
+
+        self._rotate_lock  = threading.Lock()
+        self._size         = os.path.getsize(path)
+        self._rotate_at    = time.time() + interval if interval is not None else None
+
+    def write(self, text: str):
+        """Writes given text to the file. Rotates file before, if it is required
+
+        :param text: Text to write into file
+        :type text: str
+        """
+
+        if self._fd is not None:
+            super().write(text)
+            return
+
+        # size of the file is counted in bytes (as its initial size)
+        size = len(text) if text.isascii() else len(text.encode(self.io.encoding or 'utf-8', 'replace'))
+
+        with self._rotate_lock:
+            if self._must_rotate(size):
+                self.rotate()
+
+            super().write(text)
+            self._size += size
+
+    def _write_views(self, views: list[memoryview]):
+        size = sum([len(v) for v in views])
+
+        with self._rotate_lock:
+            if self._must_rotate(size):
+                self.rotate()
+
+            super()._write_views(views)
+            self._size += size
+
+    def _must_rotate(self, size: int) -> bool:
+        return self._size > 0 and ((0 < self.max_bytes < self._size + size) or
+                                   (self._rotate_at is not None and time.time() >= self._rotate_at))
+
+    def rotate(self):
+        """Renames current file to the segment and opens a new file"""
 
-    def __del__(self):
         self.io.close()
 
+        segment = f'{self.path}.{time.strftime("%Y%m%d-%H%M%S")}'
+
+        # there may be few rotations in one second
+        counter = 0
+        while any(os.path.exists(segment + (f'-{counter}' if counter else '') + ext)
+                  for ext in ('', *self.COMPRESSIONS.values())):
+            counter += 1
+
+        if counter:
+            segment += f'-{counter}'
+
+        os.replace(self.path, segment)
+
+        self.io          = self._open(self.path, 'w', self._fd is not None)
+        self._fd         = self._fileno() if self._fd is not None else None
+        self._size       = 0
+        self._rotate_at  = time.time() + self.interval if self.interval is not None else None
+
+        if self.compression is not None:
+            _compressor.submit(self, segment)
+        else:
+            self.remove_old_segments()
+
+    def segments(self) -> list[str]:
+        """Returns rotated segments of the file (from the oldest to the newest)
 
-class StdoutHandler(LoggerHandler):
-    """Handle stdout output (console output)"""
+        :returns: Paths of the segments
+        :rtype: list[str]
+        """
+        return rotated_segments(self.path)
+
+    def remove_old_segments(self):
+        """Removes segments over the ``backup_count``"""
+
+        if self.backup_count <= 0:
+            return
+
+        for segment in self.segments()[:-self.backup_count]:
+            try:
+                os.remove(segment)
+            except FileNotFoundError:
+                pass
+
+
+class _SegmentCompressor:
+    """Background thread, that compresses rotated segments"""
+
+    def __init__(self):
+        # queue and thread are made by the first rotated segment
+        self.queue   = None
+        self.thread  = None
+        self.lock    = threading.Lock()
+
+    def submit(self, handler: RotatingFileHandler, segment: str):
+        """Puts segment to the queue of compression
+
+        :param handler: Handler, that rotated the segment
+        :type handler: RotatingFileHandler
+        :param segment: Path to the segment
+        :type segment: str
+        """
+
+        with self.lock:
+            if self.thread is None:
+                import queue
+
+                self.queue  = queue.Queue()
+                self.thread = threading.Thread(target=self.run, name='ezlog-compressor', daemon=True)
+                self.thread.start()
+
+        self.queue.put((handler, segment))
+
+    def run(self):
+        while True:
+            handler, segment = self.queue.get()
+
+            try:
+                self.compress(segment, handler.compression)
+                handler.remove_old_segments()
+
+            except OSError:
+                # segment stays uncompressed
+                pass
+
+            finally:
+                self.queue.task_done()
+
+    @staticmethod
+    def compress(segment: str, compression: str):
+        """Compresses segment and removes source file
+
+        :param segment: Path to the segment
+        :type segment: str
+        :param compression: Compression (``gzip`` or ``lzma``)
+        :type compression: str
+        """
+
+        import shutil
+
+        if compression == 'gzip':
+            import gzip
+            opener = gzip.open
+        else:
+            import lzma
+            opener = lzma.open
+
+        target = segment + RotatingFileHandler.COMPRESSIONS[compression]
+
+        with open(segment, 'rb') as src, opener(target + '.tmp', 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+
+        os.replace(target + '.tmp', target)
+        os.remove(segment)
+
+    def wait(self):
+        """Waits until all queued segments are compressed"""
+
+        if self.thread is not None:
+            self.queue.join()
+
+
+_compressor = _SegmentCompressor()
+atexit.register(_compressor.wait)
+
+
+class StdoutHandler(_RawHandler):
+    """Handle stdout output (console output).
+       In the ``raw`` mode records are written into the descriptor of the ``sys.stdout``
+       (its text buffer is flushed before, so the order with other output is kept)
+    """
 
     def __init__(self,
+                 raw: bool = False,
                  **kwargs: typing.Any):
         """
+        :param raw: Write encoded records directly into the file descriptor (see :class:`_RawHandler`)
+        :type raw: bool
         :param kwargs: Key=value parameters for the LoggerHandler
         :type kwargs: typing.Any
 
@@ -110,19 +1168,36 @@ class StdoutHandler(LoggerHandler):
         :type colors: bool
         :param exceptions: Enable exception handling for this handler
         :type exceptions: bool
+        :param buffer_size: Size of the buffer in characters (0 disables buffering)
+        :type buffer_size: int
+        :param flush_interval: Max time in seconds, that record can stay in the buffer (None is unlimited)
+        :type flush_interval: float | None
+        :param flush_level: Records of this level (or higher) flush the buffer immediately
+        :type flush_level: LogLevelType
         """
-        super().__init__(sys.stdout, **kwargs)
+        super().__init__(sys.stdout, raw=raw, **kwargs)
 
-    def __del__(self):
-        pass
+    def _write_views(self, views: list[memoryview]):
+        self.io.flush()
+        super()._write_views(views)
+
+    def close(self):
+        """Flushes the buffer (stream itself stays open)"""
+        self.flush()
 
 
-class StderrHandler(LoggerHandler):
-    """Handle stderr output (console error output)"""
+class StderrHandler(_RawHandler):
+    """Handle stderr output (console error output).
+       In the ``raw`` mode records are written into the descriptor of the ``sys.stderr``
+       (its text buffer is flushed before, so the order with other output is kept)
+    """
 
     def __init__(self,
+                 raw: bool = False,
                  **kwargs: typing.Any):
         """
+        :param raw: Write encoded records directly into the file descriptor (see :class:`_RawHandler`)
+        :type raw: bool
         :param kwargs: Key=value parameters for the LoggerHandler
         :type kwargs: typing.Any
 
@@ -136,8 +1211,19 @@ class StderrHandler(LoggerHandler):
         :type colors: bool
         :param exceptions: Enable exception handling for this handler
         :type exceptions: bool
+        :param buffer_size: Size of the buffer in characters (0 disables buffering)
+        :type buffer_size: int
+        :param flush_interval: Max time in seconds, that record can stay in the buffer (None is unlimited)
+        :type flush_interval: float | None
+        :param flush_level: Records of this level (or higher) flush the buffer immediately
+        :type flush_level: LogLevelType
         """
-        super().__init__(sys.stderr, **kwargs)
+        super().__init__(sys.stderr, raw=raw, **kwargs)
 
-    def __del__(self):
-        pass
+    def _write_views(self, views: list[memoryview]):
+        self.io.flush()
+        super()._write_views(views)
+
+    def close(self):
+        """Flushes the buffer (stream itself stays open)"""
+        self.flush()
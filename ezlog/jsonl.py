@@ -0,0 +1,204 @@
+"""
+JSON Lines handler. Every record is written as one JSON object per line
+"""
+
+import json.encoder
+import math
+import time
+import typing
+from os import PathLike
+
+from .handlers import LoggerHandler
+from .utils import level_to_name
+
+if typing.TYPE_CHECKING:
+    from .record import LogRecord
+
+__all__ = ['JSON_FIELDS', 'JsonLinesHandler', 'JsonFileHandler']
+
+JSON_FIELDS = ('time', 'timestamp', 'level', 'group_name', 'name', 'message', 'args', 'caller', 'exception')
+"""Fields, that can be written by the JSON handlers:
+
+* ``time`` - time formatted by the time formatter of the logger
+* ``timestamp`` - time in nanoseconds since epoch
+* ``level`` - name of the level
+* ``group_name`` - full name of the logger group (``ezlog`` if logger hasn't group)
+* ``name`` - name of the logger
+* ``message`` - message formatted with the arguments
+* ``args`` - arguments of the message (numbers, booleans and None as is, other as strings)
+* ``caller`` - object with ``file``, ``line`` and ``function`` of the log call
+* ``exception`` - formatted traceback (null if there is no exception)
+"""
+
+_encode_str = json.encoder.encode_basestring
+
+
+def _encode_arg(arg: typing.Any, text: str) -> str:
+    t = type(arg)
+
+    if arg is None:
+        return 'null'
+    if t is bool:
+        return 'true' if arg else 'false'
+    if t is int:
+        return int.__repr__(arg)
+    if t is float:
+        if math.isfinite(arg):
+            return float.__repr__(arg)
+        return 'NaN' if arg != arg else ('Infinity' if arg > 0 else '-Infinity')
+
+    # strings of the arguments are shared with the text handlers
+    return _encode_str(text)
+
+
+class JsonLinesHandler(LoggerHandler):
+    """Handler, that writes records as JSON Lines.
+       Only selected fields are serialized. Static parts of the line (names of the logger and group,
+       level, caller file and function) are encoded once and cached
+
+    :ivar fields: Fields to write (see :data:`JSON_FIELDS`)
+    :type fields: tuple[str, ...]
+    """
+
+    def __init__(self,
+                 io: typing.TextIO | None = None,
+                 fields: typing.Iterable[str] = JSON_FIELDS,
+                 **kwargs: typing.Any):
+        """
+        :param io: TextIO to handle
+        :type io: TextIO | None
+        :param fields: Fields to write (see :data:`JSON_FIELDS`), in the order of the output
+        :type fields: Iterable[str]
+        :param kwargs: Key=value parameters for the LoggerHandler
+        :type kwargs: typing.Any
+
+        :raises ValueError: When unknown field is given
+        """
+
+        kwargs['colors'] = False
+
+        super().__init__(io, **kwargs)
+
+        self.fields = tuple(fields)
+
+        for field in self.fields:
+            if field not in JSON_FIELDS:
+                raise ValueError(f'Unknown JSON field "{field}"')
+
+        # serializers of the selected fields
+        self._serializers = [getattr(self, f'_field_{field}') for field in self.fields]
+
+        # pre-encoded static fragments
+        self._fragments  = {}
+        self._callers    = {}
+
+    def _fragment(self, field: str, value: str) -> str:
+        fragment = self._fragments.get((field, value))
+
+        if fragment is None:
+            fragment = self._fragments[(field, value)] = f'"{field}":{_encode_str(value)}'
+
+        return fragment
+
+    def _field_time(self, record: 'LogRecord') -> str:
+        return '"time":' + _encode_str(record.time_str)
+
+    def _field_timestamp(self, record: 'LogRecord') -> str:
+        return '"timestamp":' + str(record.timestamp)
+
+    def _field_level(self, record: 'LogRecord') -> str:
+        return self._fragment('level', level_to_name(record.level))
+
+    def _field_group_name(self, record: 'LogRecord') -> str:
+        return self._fragment('group_name', record.group_name)
+
+    def _field_name(self, record: 'LogRecord') -> str:
+        return self._fragment('name', record.name)
+
+    def _field_message(self, record: 'LogRecord') -> str:
+        return '"message":' + _encode_str(record.text)
+
+    def _field_args(self, record: 'LogRecord') -> str:
+        return '"args":[' + ','.join([_encode_arg(a, text) for a, text in zip(record.values, record.args_str)]) + ']'
+
+    def _field_caller(self, record: 'LogRecord') -> str:
+        caller  = record.caller
+        key     = (caller.filename, caller.function)
+
+        fragment = self._callers.get(key)
+
+        if fragment is None:
+            fragment = self._callers[key] = \
+                f'"caller":{{"file":{_encode_str(caller.filename)},"function":{_encode_str(caller.function)},"line":'
+
+        return fragment + str(caller.lineno) + '}'
+
+    def _field_exception(self, record: 'LogRecord') -> str:
+        if record.exception is None or not self.exceptions:
+            return '"exception":null'
+
+        return '"exception":' + _encode_str(record.traceback_text)
+
+    def serialize(self, record: 'LogRecord') -> str:
+        """Serializes record into JSON object (without line end)
+
+        :param record: Record to serialize
+        :type record: LogRecord
+
+        :returns: JSON object
+        :rtype: str
+        """
+        return '{' + ','.join([serializer(record) for serializer in self._serializers]) + '}'
+
+    def format(self, record: 'LogRecord') -> str:
+        """Serializes record into the line
+
+        :param record: Record to serialize
+        :type record: LogRecord
+
+        :returns: JSON object with the line end
+        :rtype: str
+        """
+        return self.serialize(record) + '\n'
+
+    def emit(self, record: 'LogRecord'):
+        """Serializes record and writes it as a line
+
+        :param record: Record to write
+        :type record: LogRecord
+        """
+
+        if self.metrics is None:
+            self.handle(self.serialize(record) + '\n', record.level)
+            return
+
+        started  = time.perf_counter_ns()
+        text     = self.serialize(record) + '\n'
+        self.metrics.add_format(time.perf_counter_ns() - started)
+
+        self.handle(text, record.level)
+
+
+class JsonFileHandler(JsonLinesHandler):
+    """Writes JSON Lines into the file
+
+    :ivar path: Path to the file
+    :type path: PathLike[str] | str
+    """
+
+    def __init__(self,
+                 path: PathLike[str] | str,
+                 mode: str = 'a',
+                 **kwargs: typing.Any):
+        """
+        :param path: Path to the file
+        :type path: PathLike[str] | str
+        :param mode: Mode of the file opening (``w`` - overwrite, ``a`` - append)
+        :type mode: str
+        :param kwargs: Parameters of the :class:`JsonLinesHandler`
+        :type kwargs: typing.Any
+        """
+
+        super().__init__(open(path, mode, encoding='utf-8'), **kwargs)
+
+        self.path = path
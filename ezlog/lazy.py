@@ -0,0 +1,139 @@
+"""
+Lazy arguments of the records and limiting of the arguments length. Lazy argument is evaluated
+only if the record passes levels of the handlers, and only once for all handlers
+"""
+
+import typing
+
+__all__ = ['Lazy', 'format_arg']
+
+# not evaluated value of the lazy argument
+_NOT_EVALUATED = object()
+
+# builtin containers, that are rendered up to the length limit: type -> (opening, closing)
+_CONTAINERS = {
+    list:       ('[', ']'),
+    tuple:      ('(', ')'),
+    dict:       ('{', '}'),
+    set:        ('{', '}'),
+    frozenset:  ('frozenset({', '})'),
+}
+
+# end of the cut argument
+_ELLIPSIS = '…'
+
+
+class Lazy:
+    """Argument, that is evaluated only when the record is rendered. Records, rejected by the levels
+       of the handlers (or by the rate limiter), don't call the function at all.
+       Value is cached, so it is computed once for all handlers and variants of the record.
+       Arguments are colored by the type of the value
+
+       Example::
+
+           logger.debug('State: {}', Lazy(build_summary, data))
+           logger.debug('Items: {}', Lazy(lambda: sorted(items)))
+
+    :ivar func: Function, that computes the value
+    :type func: Callable
+    """
+
+    __slots__ = ('func', 'args', 'kwargs', '_value')
+
+    def __init__(self, func: typing.Callable[..., typing.Any], *args: typing.Any, **kwargs: typing.Any):
+        """
+        :param func: Function, that computes the value
+        :type func: Callable
+        :param args: Positional arguments of the function
+        :type args: Any
+        :param kwargs: Keyword arguments of the function
+        :type kwargs: Any
+        """
+
+        self.func    = func
+        self.args    = args
+        self.kwargs  = kwargs
+        self._value  = _NOT_EVALUATED
+
+    @property
+    def value(self) -> typing.Any:
+        """Value of the argument (function is called on the first access)"""
+
+        if self._value is _NOT_EVALUATED:
+            self._value = self.func(*self.args, **self.kwargs)
+
+        return self._value
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        if self._value is _NOT_EVALUATED:
+            return f'Lazy({self.func!r})'
+
+        return f'Lazy({self.func!r}, value={self._value!r})'
+
+
+def _bounded_repr(obj: typing.Any, limit: int, active: set[int]) -> str:
+    """Returns ``repr`` of the object. Builtin containers are rendered only until the limit is reached"""
+
+    brackets = _CONTAINERS.get(type(obj))
+
+    if brackets is None or not obj:
+        return repr(obj)
+
+    opening, closing = brackets
+
+    # recursive containers
+    if id(obj) in active:
+        return opening + '...' + closing
+
+    active.add(id(obj))
+
+    parts  = []
+    size   = 0
+    cut    = False
+
+    for item in (obj.items() if type(obj) is dict else obj):
+        if size > limit:
+            cut = True
+            break
+
+        if type(obj) is dict:
+            text = _bounded_repr(item[0], limit, active) + ': ' + _bounded_repr(item[1], limit, active)
+        else:
+            text = _bounded_repr(item, limit, active)
+
+        parts.append(text)
+        size += len(text) + 2
+
+    active.discard(id(obj))
+
+    if cut:
+        parts.append('...')
+    elif type(obj) is tuple and len(parts) == 1:
+        return opening + parts[0] + ',' + closing
+
+    return opening + ', '.join(parts) + closing
+
+
+def format_arg(obj: typing.Any, limit: int | None = None) -> str:
+    """Converts argument of the record into the string (as ``str``), cut to the limit.
+       Builtin containers (lists, tuples, dicts, sets) are rendered only up to the limit,
+       so huge containers aren't converted entirely
+
+    :param obj: Argument to convert
+    :type obj: Any
+    :param limit: Max length of the string (None - no limit). Cut string ends with ``…``
+    :type limit: int | None
+
+    :returns: String of the argument
+    :rtype: str
+    """
+
+    if limit is None:
+        return str(obj)
+
+    text = _bounded_repr(obj, limit, set()) if type(obj) in _CONTAINERS else str(obj)
+
+    return text if len(text) <= limit else text[:limit] + _ELLIPSIS
@@ -2,27 +2,43 @@
 Declares Logger - main class of this library.
 """
 
-import colorama
-import inspect
-import traceback
-from datetime import datetime
+import contextlib
+import sys
+import threading
+import time
+import typing
 from typing import Any
 
 from .utils import *
-from ._types import ColorSetType
-from .handlers import LoggerHandler
-from .loggergroup import LoggerGroup, LOGGER_GROUPS
+from ._types import ColorSetType, LogLevelType
+from .utils import ConfigGeneration
+from .template import CompiledTemplate, compile_template, message_template, uses_fields, COLOR_FIELDS
+from .timeformat import get_time_renderer
+from .record import LogRecord
+from .handlers import LoggerHandler, HandlerList
+from .loggergroup import LoggerGroup, LOGGER_GROUPS, get_group, _setting, _handler_list, _threshold, _resolve_settings
 from .defaults import *
+from . import _ansi
+
+if typing.TYPE_CHECKING:
+    import inspect
+    from datetime import datetime
+    from .ratelimit import RateLimiter
+    from .metrics import Metrics
 
 __all__ = ['DEFAULT_COLOR_SET', 'DEFAULT_FORMATTER', 'DEFAULT_TIME_FORMATTER',
            'LOGGER_GROUPS', 'reset', 'Logger']
 
 # colors reset
-reset = colorama.Style.RESET_ALL
+reset = _ansi.Style.RESET_ALL
 
 
 class Logger:
-    """Class of the Logger"""
+    """Class of the Logger
+
+       Settings, that aren't set (None), are inherited from the group (see :class:`ezlog.loggergroup.LoggerGroup`).
+       Resolved settings are cached until the configuration changes
+    """
 
     def __init__(self,
                  name: str,
@@ -30,7 +46,15 @@ class Logger:
                  time_formatter: str | None = None,
                  color_set: ColorSetType | None = None,
                  handlers: list[LoggerHandler] | None = None,
-                 group: LoggerGroup | str | None = None
+                 group: LoggerGroup | str | None = None,
+                 capture_caller: bool | None = None,
+                 clock: str | None = None,
+                 rate_limiter: typing.Optional['RateLimiter'] = None,
+                 metrics: typing.Optional['Metrics'] = None,
+                 log_level: LogLevelType | None = None,
+                 traceback_limit: int | None = None,
+                 chain_limit: int | None = None,
+                 max_arg_length: int | None = None
                  ):
         """
         :param name: Name of the logger
@@ -39,45 +63,149 @@ class Logger:
         :type formatter: str | None
         :param time_formatter: String formatter for the time
         :type time_formatter: str
-        :param color_set: Colors set to use (dict with the colors)
+        :param color_set: Colors set to use (dict with the colors). Colors of the arguments types are cached,
+                          if ``types`` of the set is :class:`ezlog.utils.ColorMap` (plain dict is looked up
+                          by the MRO of every argument)
         :type color_set: ColorSetType
-        :param handlers: Handlers (List with the LoggerHandler instances). It is using to write records in
+        :param handlers: Handlers (List with the LoggerHandler instances). It is using to write records in.
+                         Plain list is copied into :class:`ezlog.handlers.HandlerList`, so later changes must be
+                         done through the ``handlers`` property of the logger, not through the passed list
         :type handlers: list[LoggerHandler]
-        :param group: Group of the handler (Copy all values from)
+        :param group: Group of the logger (not set settings are inherited from it), or full name of the group
         :type group: LoggerGroup | str | None
+        :param capture_caller: Capture information about caller of the log function (``stack`` field
+                               of the formatter). If disabled, ``stack`` is :data:`ezlog.utils.NO_CALLER`
+                               (True by default)
+        :type capture_caller: bool | None
+        :param clock: Clock source of the records time (``wall``, ``coarse`` or ``monotonic``, see :data:`ezlog.timeformat.CLOCKS`)
+        :type clock: str | None
+        :param rate_limiter: Rate limiter of the records (see :class:`ezlog.ratelimit.RateLimiter`)
+        :type rate_limiter: RateLimiter | None
+        :param metrics: Counters of the pipeline (see :class:`ezlog.metrics.Metrics`)
+        :type metrics: Metrics | None
+        :param log_level: Min level of the records of the logger (in addition to the levels of the handlers)
+        :type log_level: LogLevelType | None
+        :param traceback_limit: Max count of the frames of every exception in the traceback
+                                (negative value keeps the last frames, see :mod:`ezlog.tracebacks`)
+        :type traceback_limit: int | None
+        :param chain_limit: Max count of the chained exceptions (causes and contexts) in the traceback
+        :type chain_limit: int | None
+        :param max_arg_length: Max length of the string of every argument (longer ones are cut,
+                               see :func:`ezlog.lazy.format_arg`)
+        :type max_arg_length: int | None
+
+        :raises StringGroupNotFoundException: When string group not found
         """
 
         self.name = name
 
-        if group is not None:
-            # copy settings from the logger group
+        # own settings, precomputed minimum level and routes of the handlers (see refresh())
+        self._own         = {}
+        self._group       = None
+        self._generation  = -1
+        self._min_level   = DISABLED_LEVEL
+        self._routes      = {}
+
+        # records collected by the batches of the threads (see batch())
+        self._batch       = threading.local()
+        self._batches     = 0
+        self._batch_lock  = threading.Lock()
+
+        own = {'formatter':       formatter,
+               'time_formatter':  time_formatter,
+               'color_set':       color_set,
+               'handlers':        _handler_list(handlers) if handlers is not None else None,
+               'capture_caller':  capture_caller,
+               'clock':           clock,
+               'rate_limiter':    rate_limiter,
+               'metrics':         metrics,
+               'log_level':       _threshold(log_level),
+               'traceback_limit': traceback_limit,
+               'chain_limit':     chain_limit,
+               'max_arg_length':  max_arg_length}
+
+        self._own.update((k, v) for k, v in own.items() if v is not None)
+
+        if group is None:
+            # logger without group always has its own list of handlers
+            self._own.setdefault('handlers', HandlerList())
+
+        self.group = group
+
+        self.refresh()
+
+    formatter       = _setting('formatter', 'String formatter of the record')
+    time_formatter  = _setting('time_formatter', 'String formatter for the time')
+    color_set       = _setting('color_set', 'Colors set to use')
+    handlers        = _setting('handlers', 'Handlers of the logger (own or of the group). '
+                                           'Changes of this list are tracked to keep precomputed level up-to-date',
+                               _handler_list)
+    capture_caller  = _setting('capture_caller', 'Capture information about caller of the log function')
+    clock           = _setting('clock', 'Clock source of the records time')
+    rate_limiter    = _setting('rate_limiter', 'Rate limiter of the records')
+    metrics         = _setting('metrics', 'Counters of the pipeline')
+    log_level       = _setting('log_level', 'Min level of the records of the logger (None - only levels '
+                                            'of the handlers are used)', _threshold)
+    traceback_limit = _setting('traceback_limit', 'Max count of the frames of every exception in the traceback')
+    chain_limit     = _setting('chain_limit', 'Max count of the chained exceptions in the traceback')
+    max_arg_length  = _setting('max_arg_length', 'Max length of the string of every argument')
+
+    @property
+    def group(self) -> LoggerGroup | None:
+        """Group of the logger. Not set settings of the logger are inherited from it"""
+        return self._group
+
+    @group.setter
+    def group(self, group: LoggerGroup | str | None):
+        if isinstance(group, str):
+            group = get_group(group)
+
+        self._group = group
+        ConfigGeneration.bump()
+
+    def initialize_group(self):
+        """Re-reads settings of the group. Settings are resolved automatically,
+           so this method is kept only for compatibility
+        """
+        self.refresh()
+
+    def refresh(self):
+        """Resolves inherited settings, recomputes the minimum level of the handlers and resets cached routes
+           of the records. Called automatically when the configuration changes
+        """
 
-            if isinstance(group, str):
-                group = LOGGER_GROUPS[group]
+        generation = ConfigGeneration.value
 
-            self.group = group
+        _resolve_settings(self, self._group)
 
-            self.initialize_group()
+        self._routes      = {}
+        self._generation  = generation
 
-        else:
+    @property
+    def effective_level(self) -> int | float:
+        """Minimum level accepted by at least one handler (:data:`DISABLED_LEVEL` if there are no handlers)"""
 
-            # register logger settings
-            self.formatter       = formatter if formatter is not None else DEFAULT_FORMATTER
-            self.time_formatter  = time_formatter if time_formatter is not None else DEFAULT_TIME_FORMATTER
-            self.color_set       = color_set if color_set is not None else DEFAULT_COLOR_SET
-            self.handlers        = handlers if handlers is not None else []
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
 
-            self.group           = None
+        return self._min_level
 
-    def initialize_group(self):
-        """Copy all settings from the group to itself"""
+    def is_enabled_for(self, level: int) -> bool:
+        """Checks if any handler of the logger accepts given level
 
-        self.formatter       = self.group.formatter
-        self.time_formatter  = self.group.time_formatter
-        self.color_set       = self.group.color_set
-        self.handlers        = self.group.handlers
+        :param level: Level to check
+        :type level: int
 
-    def format_time(self, time: datetime) -> str:
+        :returns: True if record of the given level will be written to at least one handler
+        :rtype: bool
+        """
+
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        return level >= self._min_level
+
+    def format_time(self, time: 'datetime') -> str:
         """Formats a time with time_formatter attribute
 
         :param time: Time to format
@@ -87,15 +215,16 @@ class Logger:
         :rtype: str
         """
 
-        return self.time_formatter.format(year=time.year,
-                                          month=time.month,
-                                          day=time.day,
-                                          hour=time.hour,
-                                          minute=time.minute,
-                                          second=time.second,
-                                          microsecond=str(time.microsecond)[:4])
+        return compile_template(self.time_formatter).render((), {'year':         time.year,
+                                                                 'month':        time.month,
+                                                                 'day':          time.day,
+                                                                 'hour':         time.hour,
+                                                                 'minute':       time.minute,
+                                                                 'second':       time.second,
+                                                                 'microsecond':  str(time.microsecond)[:4]})
 
-    def format_message(self, message: str, args_str: list[str], level_str: str, time_str: str, stack: inspect.FrameInfo) -> str:
+    def format_message(self, message: str, args_str: list[str], level_str: str, time_str: str,
+                       stack: typing.Union[CallerInfo, 'inspect.FrameInfo']) -> str:
         """Formats given message with formatter attribute
 
         :param message: Message to format
@@ -106,41 +235,68 @@ class Logger:
         :type level_str: str
         :param time_str: Time parameter
         :type time_str:
-        :param stack: FrameInfo about caller of the log function
-        :type stack: inspect.FrameInfo
+        :param stack: Information about caller of the log function
+        :type stack: CallerInfo | inspect.FrameInfo
 
         :returns: Formatter string
         :rtype: str
         """
 
-        gname = self.group.group_link if self.group is not None else 'ezlog'
-
-        return self.formatter.format(message=message.format(*args_str,
-                                                            time=time_str,
-                                                            name=self.name,
-                                                            group_name=gname,
-                                                            level=level_str,
-                                                            foreground=colorama.Fore,
-                                                            background=colorama.Back,
-                                                            style=colorama.Style,
-                                                            reset=reset,
-                                                            stack=stack),
-                                     time=time_str,
-                                     name=self.name,
-                                     group_name=gname,
-                                     level=level_str,
-                                     foreground=colorama.Fore,
-                                     background=colorama.Back,
-                                     style=colorama.Style,
-                                     reset=reset,
-                                     stack=stack
-                                     )
+        formatter_t  = compile_template(self.formatter)
+        message_t    = message_template(message)
+
+        kwargs = self._format_kwargs(formatter_t, message_t, level_str, time_str, stack)
+        kwargs['message'] = message_t.render(args_str, kwargs)
+
+        return formatter_t.render((), kwargs)
+
+    def format_text(self, message: str, args_str: list[str], level_str: str, time_str: str,
+                    stack: typing.Union[CallerInfo, 'inspect.FrameInfo']) -> str:
+        """Formats given message with the arguments only (without formatter attribute)
+
+        :param message: Message to format
+        :type message: str
+        :param args_str: Arguments to format message with
+        :type args_str: list[str]
+        :param level_str: Level parameter
+        :type level_str: str
+        :param time_str: Time parameter
+        :type time_str: str
+        :param stack: Information about caller of the log function
+        :type stack: CallerInfo | inspect.FrameInfo
+
+        :returns: Formatted message
+        :rtype: str
+        """
+
+        message_t = message_template(message)
+
+        return message_t.render(args_str, self._format_kwargs(None, message_t, level_str, time_str, stack))
+
+    def _format_kwargs(self, formatter_t: CompiledTemplate | None, message_t: CompiledTemplate,
+                       level_str: str, time_str: str, stack: typing.Union[CallerInfo, 'inspect.FrameInfo']) -> dict[str, Any]:
+        """Makes keyword fields for the formatter and the message templates"""
+
+        kwargs = {'time':        time_str,
+                  'name':        self.name,
+                  'group_name':  self.group.group_link if self.group is not None else 'ezlog',
+                  'level':       level_str,
+                  'stack':       stack}
+
+        # color namespaces are passed only to the templates that use them
+        if uses_fields(message_t, COLOR_FIELDS) or (formatter_t is not None and uses_fields(formatter_t, COLOR_FIELDS)):
+            kwargs['foreground']  = _ansi.Fore
+            kwargs['background']  = _ansi.Back
+            kwargs['style']       = _ansi.Style
+            kwargs['reset']       = reset
+
+        return kwargs
 
     def record(self, message: str,
                *args: Any,
                level: int | str = LogLevel.NOTSET,
                exception: Exception | None = None,
-               stack: inspect.FrameInfo | None = None):
+               stack: typing.Union[CallerInfo, 'inspect.FrameInfo', None] = None):
         """Records a log to the handlers with formatters usage
 
         :param message: Message to record
@@ -151,41 +307,279 @@ class Logger:
         :type level: int | str
         :param exception: Exception (if haven) to log
         :type exception: Exception | None
-        :param stack: FrameInfo about caller of the log function
-        :type stack: inspect.FrameInfo
+        :param stack: Information about caller of the log function (captured automatically if None)
+        :type stack: CallerInfo | inspect.FrameInfo | None
         """
 
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        # all handlers reject this level
+        if level < self._min_level:
+            if self._metrics is not None:
+                self._metrics.count_filtered()
+            return
+
         if stack is None:
-            stack = inspect.stack()[1]
+            if self._metrics is not None:
+                started  = time.perf_counter_ns()
+                stack    = CallerInfo(sys._getframe(1)) if self._capture_caller else NO_CALLER
+                self._metrics.add_capture(time.perf_counter_ns() - started)
+            else:
+                stack = CallerInfo(sys._getframe(1)) if self._capture_caller else NO_CALLER
+
+        if self._rate_limiter is not None and not self._rate_limiter.allow(self, level, message, args, stack):
+            if self._metrics is not None:
+                self._metrics.count_suppressed()
+            return
+
+        self.dispatch(level, message, args, stack, exception)
+
+    def dispatch(self, level: int, message: str, args: tuple, stack: typing.Union[CallerInfo, 'inspect.FrameInfo'],
+                 exception: Exception | None = None):
+        """Creates the record and passes it to the handlers, accepting its level (without rate limiter)
+
+        :param level: Log level of the record
+        :type level: int
+        :param message: Message to record
+        :type message: str
+        :param args: Arguments to format with message
+        :type args: tuple
+        :param stack: Information about caller of the log function
+        :type stack: CallerInfo | inspect.FrameInfo
+        :param exception: Exception (if haven) to log
+        :type exception: Exception | None
+        """
+
+        record = LogRecord(self, level, get_time_renderer(self._time_formatter, self._clock).clock(),
+                           message, args, stack, exception)
+
+        if self._metrics is not None:
+            self._metrics.count_emitted(level)
+
+        # record is collected by the batch of this thread
+        if self._batches:
+            records = getattr(self._batch, 'records', None)
+
+            if records is not None:
+                record.freeze()
+                records.append(record)
+
+                if len(records) >= self._batch.size:
+                    self._flush_batch()
+                return
+
+        # pass record to the handlers (they render it, if needed)
+        for h in self._routes.get(level) or self._make_route(level):
+            h.emit(record)
+
+    def log_many(self, level: int | str, message: str, rows: typing.Iterable[typing.Iterable[Any]],
+                 size: int = 1000):
+        """Records the message with every row of the arguments. Records share the time and the caller
+           (they are captured once), every handler renders them and writes by one write
+
+           Example::
+
+               logger.log_many('info', 'User {} has {} points', [('alice', 10), ('bob', 7)])
+
+        :param level: Log level of the records
+        :type level: int | str
+        :param message: Message to record
+        :type message: str
+        :param rows: Arguments of the records (every row is formatted with the message)
+        :type rows: Iterable[Iterable[Any]]
+        :param size: Max count of the records, passed to the handlers at once
+        :type size: int
+        """
+
+        level = name_to_level(level)
+
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        if level < self._min_level:
+            if self._metrics is not None:
+                for _ in rows:
+                    self._metrics.count_filtered()
+            return
+
+        stack      = CallerInfo(sys._getframe(1)) if self._capture_caller else NO_CALLER
+        timestamp  = get_time_renderer(self._time_formatter, self._clock).clock()
+        records    = []
+
+        for row in rows:
+            args = tuple(row)
+
+            if self._rate_limiter is not None and not self._rate_limiter.allow(self, level, message, args, stack):
+                if self._metrics is not None:
+                    self._metrics.count_suppressed()
+                continue
+
+            record = LogRecord(self, level, timestamp, message, args, stack)
+            record.freeze()
+            records.append(record)
+
+            if self._metrics is not None:
+                self._metrics.count_emitted(level)
+
+            if len(records) >= size:
+                self._collect(records)
+                records = []
+
+        if records:
+            self._collect(records)
+
+    @contextlib.contextmanager
+    def batch(self, size: int = 1000) -> typing.Iterator['Logger']:
+        """Collects records of the current thread and passes them to the handlers together, when the block
+           exits (or when ``size`` records are collected). Every handler renders collected records
+           and writes them by one write. Nested batch is a part of the outer one
+
+           Example::
+
+               with logger.batch():
+                   for row in rows:
+                       logger.info('Row {} is processed', row)
+
+        :param size: Max count of the collected records
+        :type size: int
+
+        :returns: Context manager (its value is the logger)
+        """
+
+        local = self._batch
+
+        if getattr(local, 'records', None) is not None:
+            yield self
+            return
+
+        local.records  = []
+        local.size     = size
+
+        with self._batch_lock:
+            self._batches += 1
+
+        try:
+            yield self
+
+        finally:
+            with self._batch_lock:
+                self._batches -= 1
+
+            records, local.records = local.records, None
+
+            if records:
+                self._emit_batch(records)
+
+    def _collect(self, records: list[LogRecord]):
+        """Adds records to the batch of the current thread or passes them to the handlers, if there is no batch"""
+
+        batch = getattr(self._batch, 'records', None) if self._batches else None
+
+        if batch is None:
+            self._emit_batch(records)
+            return
+
+        batch.extend(records)
 
-        # get formatted time
-        time_str = self.format_time(datetime.now())
+        if len(batch) >= self._batch.size:
+            self._flush_batch()
 
-        # get colored args\text
-        args_str      = [str(o) for o in args]
-        args_colored  = [type_to_color(type(o), self.color_set) + str(o) + reset for o in args]
+    def _flush_batch(self):
+        """Passes collected records of the current thread to the handlers"""
 
-        level_str      = level_to_name(level)
-        level_colored  = level_to_color(level, self.color_set) + level_str + reset
+        records, self._batch.records = self._batch.records, []
+        self._emit_batch(records)
 
-        message_colored = message
+    def _emit_batch(self, records: list[LogRecord]):
+        """Passes records to the handlers: every handler gets all records, that it accepts, at once"""
+
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        targets = {}
+
+        for record in records:
+            for h in self._routes.get(record.level) or self._make_route(record.level):
+                accepted = targets.get(h)
+
+                if accepted is None:
+                    targets[h] = [record]
+                else:
+                    accepted.append(record)
+
+        for h, accepted in targets.items():
+            h.emit_many(accepted)
+
+    def render_message(self, record: LogRecord, colors: bool) -> str:
+        """Renders message line of the record (default renderer of the text handlers)
+
+        :param record: Record to render
+        :type record: LogRecord
+        :param colors: Render colored variant
+        :type colors: bool
+
+        :returns: Formatted message without line end
+        :rtype: str
+        """
+
+        level = record.level
+
+        if not colors:
+            return self.format_message(record.message, record.args_str,
+                                       level_to_name(level), record.time_str, record.caller)
+
+        resolve        = color_resolver(self.color_set)
+        args_colored   = [resolve(type(o)) + text + reset for o, text in zip(record.values, record.args_str)]
+        level_colored  = level_to_color(level, self.color_set) + level_to_name(level) + reset
+
+        message_colored = record.message
         if level == LogLevel.CRITICAL:
-            message_colored = f'{colorama.Back.LIGHTRED_EX}{colorama.Fore.BLACK}{message}{reset}'
+            message_colored = f'{_ansi.Back.LIGHTRED_EX}{_ansi.Fore.BLACK}{message_colored}{reset}'
+
+        return self.format_message(message_colored, args_colored, level_colored, record.time_str, record.caller) + reset
 
-        # get formatted message
-        f_message          = self.format_message(message, args_str, level_str, time_str, stack)
-        f_message_colored  = self.format_message(message_colored, args_colored, level_colored, time_str, stack) + reset
+    def render_text(self, record: LogRecord) -> str:
+        """Renders message of the record with the arguments (without formatter)
 
-        # write record to the handlers
-        for h in self.handlers:
-            if h.log_level <= level:
-                h.write((f_message_colored if h.colors else f_message) + '\n')
+        :param record: Record to render
+        :type record: LogRecord
 
-                if exception is not None and h.exceptions:
-                    # get color for the exception
-                    exception_color = type_to_color('exception', self.color_set) if h.colors else ''
+        :returns: Formatted message
+        :rtype: str
+        """
+
+        return self.format_text(record.message, record.args_str,
+                                level_to_name(record.level), record.time_str, record.caller)
+
+    def render_exception(self, record: LogRecord, colors: bool) -> str:
+        """Renders traceback of the record exception
+
+        :param record: Record to render
+        :type record: LogRecord
+        :param colors: Render colored variant
+        :type colors: bool
+
+        :returns: Formatted traceback with line end
+        :rtype: str
+        """
+
+        # get color for the exception
+        exception_color = type_to_color('exception', self.color_set) if colors else ''
+
+        return exception_color + record.traceback_text + reset + '\n'
+
+    def _make_route(self, level: int) -> tuple[LoggerHandler, ...]:
+        """Selects handlers accepting given level. Result is cached until the configuration changes
+
+        :param level: Level of the record
+        :type level: int
+
+        :returns: Handlers accepting the level
+        """
 
-                    h.write(exception_color + ''.join(traceback.format_exception(exception))[:-1] + reset + '\n')
+        targets = self._routes[level] = tuple(h for h in self._handlers or () if h.log_level <= level)
+        return targets
 
     def debug(self, message: str, *args: Any, exception: Exception | None = None):
         """Logs a message as DEBUG.
@@ -1,82 +1,301 @@
 
 import typing
 
-from .handlers import LoggerHandler
-from ._types import ColorSetType
+from .handlers import LoggerHandler, HandlerList
+from .utils import ConfigGeneration, DISABLED_LEVEL, name_to_level
+from ._types import ColorSetType, LogLevelType
 from .exceptions import StringGroupNotFoundException
 from .defaults import *
 
 if typing.TYPE_CHECKING:
     from .logger import Logger
+    from .ratelimit import RateLimiter
+    from .metrics import Metrics
 
-__all__ = ['LoggerGroup', 'LOGGER_GROUPS']
+__all__ = ['LoggerGroup', 'LOGGER_GROUPS', 'get_group']
 
 # logger groups
 LOGGER_GROUPS = {}
 
+# logger groups by the full names
+_GROUPS_BY_LINK = {}
+
+# inherited settings of the groups and loggers: name -> default value (used by the root)
+_SETTINGS = {
+    'formatter':       DEFAULT_FORMATTER,
+    'time_formatter':  DEFAULT_TIME_FORMATTER,
+    'color_set':       DEFAULT_COLOR_SET,
+    'handlers':        None,
+    'capture_caller':  True,
+    'clock':           'wall',
+    'rate_limiter':    None,
+    'metrics':         None,
+    'log_level':       None,
+    'traceback_limit': None,
+    'chain_limit':     None,
+    'max_arg_length':  None,
+}
+
+
+def _setting(name: str, doc: str, convert: typing.Callable[[typing.Any], typing.Any] | None = None) -> property:
+    """Makes property of the inherited setting. Getter returns value resolved by ``refresh()``
+       (own value or value of the parent), setter overrides the value, deleter resets it to the inherited one
+    """
+
+    attr = '_' + name
+
+    def getter(self):
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        return getattr(self, attr)
+
+    def setter(self, value):
+        self._own[name] = convert(value) if convert is not None else value
+        ConfigGeneration.bump()
+
+    def deleter(self):
+        self._own.pop(name, None)
+        ConfigGeneration.bump()
+
+    return property(getter, setter, deleter, doc)
+
+
+def _handler_list(handlers: list[LoggerHandler]) -> HandlerList:
+    """Returns handlers as :class:`HandlerList`. Plain list is copied: its later changes can't be tracked,
+       so they aren't seen by the loggers (handlers must be changed through the ``handlers`` property)
+    """
+
+    return handlers if isinstance(handlers, HandlerList) else HandlerList(handlers)
+
+
+def _threshold(level: LogLevelType | None) -> int | None:
+    return name_to_level(level) if level is not None else None
+
+
+def _resolve_settings(obj: typing.Any, parent: typing.Any):
+    """Resolves inherited settings of the group or logger into its private attributes"""
+
+    for name, default in _SETTINGS.items():
+        if name in obj._own:
+            value = obj._own[name]
+        elif parent is not None:
+            value = getattr(parent, name, default)
+        else:
+            value = default
+
+        setattr(obj, '_' + name, value)
+
+    # handlers, that don't reject records, and the threshold
+    handlers_level = min((h.log_level for h in obj._handlers), default=DISABLED_LEVEL) \
+        if obj._handlers is not None else DISABLED_LEVEL
+
+    obj._min_level = max(handlers_level, obj._log_level) if obj._log_level is not None else handlers_level
+
+
+def get_group(name: str) -> 'LoggerGroup':
+    """Finds logger group by its full name (``Example.Groups``) or by its name
+
+    :param name: Full name or name of the group
+    :type name: str
+
+    :returns: Found group
+    :rtype: LoggerGroup
+
+    :raises StringGroupNotFoundException: When group not found
+    """
+
+    group = _GROUPS_BY_LINK.get(name)
+
+    if group is None:
+        group = LOGGER_GROUPS.get(name)
+
+    if group is None:
+        raise StringGroupNotFoundException(name)
+
+    return group
+
 
 class LoggerGroup:
     """Group of loggers has shared parameters.
        Is highly recommended to create root logger and after pin all others logger to it
+
+       Settings are inherited: settings, that aren't set (None), are taken from the parent.
+       Changes of the settings take effect on all child groups and loggers
+       (resolved settings are cached until the configuration changes)
+
+    :ivar parent: Parent of this group
+    :type parent: LoggerGroup | None
+    :ivar children: Child groups
+    :type children: list[LoggerGroup]
+    :ivar loggers: Loggers pinned to this group by the constructor (loggers don't register themselves,
+                   group settings are resolved by the loggers)
+    :type loggers: list[Logger]
     """
 
     def __init__(self,
                  name: str,
-                 parent: typing.Union['LoggerGroup', None] = None,
+                 parent: typing.Union['LoggerGroup', str, None] = None,
                  formatter: str | None = None,
                  time_formatter: str | None = None,
                  color_set: ColorSetType | None = None,
                  handlers: list[LoggerHandler] | None = None,
-                 loggers: list['Logger'] | None = None
+                 loggers: list['Logger'] | None = None,
+                 capture_caller: bool | None = None,
+                 clock: str | None = None,
+                 rate_limiter: typing.Optional['RateLimiter'] = None,
+                 metrics: typing.Optional['Metrics'] = None,
+                 log_level: LogLevelType | None = None,
+                 traceback_limit: int | None = None,
+                 chain_limit: int | None = None,
+                 max_arg_length: int | None = None
                  ):
         """
 
         :param name: Name of the group
         :type name: str
-        :param parent: Parent of this group
-        :type parent: LoggerGroup | None
+        :param parent: Parent of this group (or its full name)
+        :type parent: LoggerGroup | str | None
         :param formatter: Formatter for the logs
         :type formatter: str | None
         :param time_formatter: Formatter for the time
         :type time_formatter: str | None
-        :param color_set: Set of the colors to use
+        :param color_set: Set of the colors to use. Use :class:`ezlog.utils.ColorMap` as its ``types``
+                          to cache colors of the arguments types
         :type color_set: ColorSetType | None
-        :param handlers: Handlers, used to write all logs into
+        :param handlers: Handlers, used to write all logs into. Plain list is copied into :class:`HandlerList`,
+                         so later changes must be done through the ``handlers`` property of the group
+                         (``group.handlers.append(handler)``), not through the passed list
         :type handlers: list[LoggerHandler] | None
         :param loggers: Loggers to be pinned to this group
         :type loggers: list[Logger] | None
+        :param capture_caller: Capture information about caller of the log function (True by default)
+        :type capture_caller: bool | None
+        :param clock: Clock source of the records time (see :data:`ezlog.timeformat.CLOCKS`, ``wall`` by default)
+        :type clock: str | None
+        :param rate_limiter: Rate limiter of the records (see :class:`ezlog.ratelimit.RateLimiter`)
+        :type rate_limiter: RateLimiter | None
+        :param metrics: Counters of the pipeline (see :class:`ezlog.metrics.Metrics`)
+        :type metrics: Metrics | None
+        :param log_level: Min level of the records of the group (in addition to the levels of the handlers)
+        :type log_level: LogLevelType | None
+        :param traceback_limit: Max count of the frames of every exception in the traceback
+                                (negative value keeps the last frames, see :mod:`ezlog.tracebacks`)
+        :type traceback_limit: int | None
+        :param chain_limit: Max count of the chained exceptions (causes and contexts) in the traceback
+        :type chain_limit: int | None
+        :param max_arg_length: Max length of the string of every argument (longer ones are cut,
+                               see :func:`ezlog.lazy.format_arg`)
+        :type max_arg_length: int | None
 
         :raises StringGroupNotFoundException: When string parent group not found
         """
         self.name = name
 
+        # own settings and the cached resolved ones (see refresh())
+        self._own         = {}
+        self._generation  = -1
+        self._min_level   = DISABLED_LEVEL
+
+        if isinstance(parent, str):
+            parent = get_group(parent)
+
+        self.parent    = parent
+        self.children  = []
+        self.loggers   = loggers if isinstance(loggers, list) else []
+
+        own = {'formatter':       formatter,
+               'time_formatter':  time_formatter,
+               'color_set':       color_set,
+               'handlers':        _handler_list(handlers) if handlers is not None else None,
+               'capture_caller':  capture_caller,
+               'clock':           clock,
+               'rate_limiter':    rate_limiter,
+               'metrics':         metrics,
+               'log_level':       _threshold(log_level),
+               'traceback_limit': traceback_limit,
+               'chain_limit':     chain_limit,
+               'max_arg_length':  max_arg_length}
+
+        self._own.update((k, v) for k, v in own.items() if v is not None)
+
         if parent is None:
-            self.formatter       = formatter if formatter is not None else DEFAULT_FORMATTER
-            self.time_formatter  = time_formatter if time_formatter is not None else DEFAULT_TIME_FORMATTER
-            self.color_set       = color_set if color_set is not None else DEFAULT_COLOR_SET
-            self.handlers        = handlers if handlers is not None else []
-            self.group_link      = self.name
+            self.group_link = self.name
+
+            # root group always has its own list of handlers
+            self._own.setdefault('handlers', HandlerList())
 
         else:
+            self.group_link = '.'.join([parent.group_link, self.name])
+            parent.children.append(self)
 
-            if isinstance(parent, str):
-                if parent not in LOGGER_GROUPS:
-                    raise StringGroupNotFoundException(parent)
+        ConfigGeneration.bump()
+
+        if isinstance(loggers, list):
+            # pin all loggers
+            for logger in loggers:
+                logger.group = self
 
-                parent = LOGGER_GROUPS[parent]
+        LOGGER_GROUPS[name]             = self
+        _GROUPS_BY_LINK[self.group_link]  = self
 
-            self.formatter       = parent.formatter
-            self.time_formatter  = parent.time_formatter
-            self.color_set       = parent.color_set
-            self.handlers        = parent.handlers
-            self.group_link      = '.'.join([parent.group_link, self.name])
+    formatter       = _setting('formatter', 'Formatter for the logs')
+    time_formatter  = _setting('time_formatter', 'Formatter for the time')
+    color_set       = _setting('color_set', 'Set of the colors to use')
+    handlers        = _setting('handlers', 'Handlers of the group (shared with child groups and loggers, '
+                                           'that haven\'t own handlers)', _handler_list)
+    capture_caller  = _setting('capture_caller', 'Capture information about caller of the log function')
+    clock           = _setting('clock', 'Clock source of the records time')
+    rate_limiter    = _setting('rate_limiter', 'Rate limiter of the records')
+    metrics         = _setting('metrics', 'Counters of the pipeline')
+    log_level       = _setting('log_level', 'Min level of the records of the group (None - only levels '
+                                            'of the handlers are used)', _threshold)
+    traceback_limit = _setting('traceback_limit', 'Max count of the frames of every exception in the traceback')
+    chain_limit     = _setting('chain_limit', 'Max count of the chained exceptions in the traceback')
+    max_arg_length  = _setting('max_arg_length', 'Max length of the string of every argument')
 
-        if isinstance(loggers, list):
-            self.loggers = loggers
+    def refresh(self):
+        """Resolves inherited settings and recomputes the minimum level of the handlers.
+           Called automatically when the configuration changes
+        """
 
-            # initialize all loggers
-            for logger in self.loggers:
-                logger.group = self
-                logger.initialize_group()
+        generation = ConfigGeneration.value
+
+        _resolve_settings(self, self.parent)
+
+        self._generation = generation
+
+    def walk(self) -> typing.Iterator['LoggerGroup']:
+        """Iterates over this group and all its descendants
+
+        :returns: Iterator over the groups
+        """
+
+        yield self
+
+        for child in self.children:
+            yield from child.walk()
+
+    @property
+    def effective_level(self) -> int | float:
+        """Minimum level accepted by at least one handler of the group"""
+
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        return self._min_level
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Checks if any handler of the group accepts given level
+
+        :param level: Level to check
+        :type level: int
+
+        :returns: True if record of the given level will be written to at least one handler
+        :rtype: bool
+        """
+
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
 
-        LOGGER_GROUPS[name] = self
+        return level >= self._min_level
@@ -0,0 +1,134 @@
+"""
+Self-instrumentation of the logging pipeline. Counters are collected only when
+:class:`Metrics` is set to the logger (group) or the handler, otherwise the hot path
+checks only that ``metrics`` attribute is None
+"""
+
+import threading
+
+from .utils import level_to_name
+
+__all__ = ['Metrics']
+
+
+class Metrics:
+    """Counters and timings of the logging pipeline. One object can be shared by loggers,
+       groups and handlers, so it collects the whole pipeline.
+
+       Collected by loggers:
+
+       * ``emitted`` - records passed to the handlers, by levels
+       * ``filtered`` - records rejected by the level of the handlers
+       * ``suppressed`` - records rejected by the rate limiter
+       * ``capture_ns`` - time spent in capturing of the caller
+
+       Collected by handlers:
+
+       * ``format_ns`` - time spent in rendering of the records
+       * ``io_ns`` - time spent in writing
+       * ``bytes_written``, ``writes`` - written data (UTF-8 bytes) and count of the writes
+       * ``flushes`` - flushes of the buffer
+       * ``dropped`` - records dropped by the queue overflow
+
+       Example::
+
+           metrics = Metrics()
+           group = LoggerGroup('App', handlers=[FileHandler('app.log', metrics=metrics)], metrics=metrics)
+
+           metrics.snapshot()  # {'emitted': {'INFO': 10}, 'filtered': 2, ...}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Resets all counters"""
+
+        with self._lock:
+            self.emitted        = {}
+            self.filtered       = 0
+            self.suppressed     = 0
+            self.bytes_written  = 0
+            self.writes         = 0
+            self.flushes        = 0
+            self.dropped        = 0
+            self.capture_ns     = 0
+            self.format_ns      = 0
+            self.io_ns          = 0
+
+    def count_emitted(self, level: int):
+        """Counts record passed to the handlers"""
+
+        with self._lock:
+            self.emitted[level] = self.emitted.get(level, 0) + 1
+
+    def count_filtered(self):
+        """Counts record rejected by the level of the handlers"""
+
+        with self._lock:
+            self.filtered += 1
+
+    def count_suppressed(self):
+        """Counts record rejected by the rate limiter"""
+
+        with self._lock:
+            self.suppressed += 1
+
+    def count_flush(self):
+        """Counts flush of the buffer"""
+
+        with self._lock:
+            self.flushes += 1
+
+    def count_dropped(self):
+        """Counts record dropped by the queue"""
+
+        with self._lock:
+            self.dropped += 1
+
+    def add_capture(self, ns: int):
+        """Adds time of the caller capturing"""
+
+        with self._lock:
+            self.capture_ns += ns
+
+    def add_format(self, ns: int):
+        """Adds time of the record rendering"""
+
+        with self._lock:
+            self.format_ns += ns
+
+    def add_write(self, size: int, ns: int):
+        """Counts written data
+
+        :param size: Size of the written data in bytes
+        :type size: int
+        :param ns: Time of the write in nanoseconds
+        :type ns: int
+        """
+
+        with self._lock:
+            self.bytes_written  += size
+            self.writes         += 1
+            self.io_ns          += ns
+
+    def snapshot(self) -> dict:
+        """Returns copy of the counters (times are in seconds)
+
+        :returns: Counters
+        :rtype: dict
+        """
+
+        with self._lock:
+            return {'emitted':          {level_to_name(level): n for level, n in self.emitted.items()},
+                    'emitted_total':    sum(self.emitted.values()),
+                    'filtered':         self.filtered,
+                    'suppressed':       self.suppressed,
+                    'bytes_written':    self.bytes_written,
+                    'writes':           self.writes,
+                    'flushes':          self.flushes,
+                    'dropped':          self.dropped,
+                    'capture_seconds':  self.capture_ns / 1e9,
+                    'format_seconds':   self.format_ns / 1e9,
+                    'io_seconds':       self.io_ns / 1e9}
@@ -0,0 +1,279 @@
+"""
+Multiprocess logging. Worker processes send records through the pipes
+to the one aggregator, that owns real handlers. Records are sent in the binary format
+(see :mod:`ezlog.binary`), so every handler of the aggregator renders them by its own settings
+"""
+
+import io
+import multiprocessing
+import multiprocessing.connection
+import struct
+import threading
+import typing
+from multiprocessing.connection import Connection
+
+from .binary import _RecordEncoder, _FrameReader
+from .decode import BinaryDecoder
+from .handlers import LoggerHandler, HandlerList, _report_error
+from .utils import LogLevel
+
+if typing.TYPE_CHECKING:
+    from .record import LogRecord
+
+__all__ = ['LogAggregator', 'ProcessHandler']
+
+# kinds of the messages: frames of the binary records or rendered text (with its level)
+_RECORDS  = b'r'
+_TEXT     = b't'
+
+# header of the text: level
+_HEADER = struct.Struct('<i')
+
+
+class ProcessHandler(LoggerHandler):
+    """Handler for the worker processes. Sends records to the :class:`LogAggregator`
+       through the channel (see :meth:`LogAggregator.open_channel`).
+       Every worker has its own pipe, so workers don't contend for a lock.
+
+       Records are sent as fields (names, message template, strings of the arguments, caller,
+       traceback), so handlers of the aggregator render them by their own settings and formats.
+       Rendered text (:meth:`handle`, :meth:`write`) is written by all handlers of the aggregator as is.
+       Channel must be used by one handler of one process (ids of the sent strings are kept by the handler)
+
+    :ivar channel: Write end of the channel
+    :type channel: Connection
+    """
+
+    def __init__(self,
+                 channel: Connection,
+                 **kwargs: typing.Any):
+        """
+        :param channel: Write end of the channel, returned by :meth:`LogAggregator.open_channel`
+        :type channel: Connection
+        :param kwargs: Key=value parameters for the LoggerHandler
+        :type kwargs: typing.Any
+        """
+
+        if 'colors' not in kwargs:
+            kwargs['colors'] = False
+
+        super().__init__(None, **kwargs)
+
+        self.channel = channel
+
+        self._encoder = _RecordEncoder()
+
+    def emit(self, record: 'LogRecord'):
+        """Sends record to the aggregator
+
+        :param record: Record to send
+        :type record: LogRecord
+        """
+
+        # ids of the strings are defined in the order of the sending, so encoding is locked too
+        with self._lock:
+            self.channel.send_bytes(_RECORDS + self._encoder.encode(record, self.exceptions))
+
+    def emit_many(self, records: list['LogRecord']):
+        """Sends records of the batch to the aggregator by one message
+
+        :param records: Records to send
+        :type records: list[LogRecord]
+        """
+
+        with self._lock:
+            self.channel.send_bytes(_RECORDS + b''.join([self._encoder.encode(r, self.exceptions) for r in records]))
+
+    def handle(self, text: str, level: int):
+        """Sends rendered text to the aggregator
+
+        :param text: Rendered record
+        :type text: str
+        :param level: Level of the record
+        :type level: int
+        """
+
+        data = _TEXT + _HEADER.pack(level) + text.encode('utf-8')
+
+        # large messages are sent by several writes, so threads must not interleave them
+        with self._lock:
+            self.channel.send_bytes(data)
+
+    def write(self, text: str):
+        """Sends given text to the aggregator (it is written by all handlers of the aggregator)
+
+        :param text: Text to write
+        :type text: str
+        """
+        self.handle(text, LogLevel.NOTSET)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Closes the channel"""
+        self.channel.close()
+
+
+class LogAggregator:
+    """Receives records from the worker processes and writes them to the handlers.
+       Works in the background thread of the main process.
+
+       Example::
+
+           aggregator = LogAggregator([FileHandler('app.log')])
+           aggregator.start()
+
+           process = multiprocessing.Process(target=worker, args=(aggregator.open_channel(),))
+           process.start()
+           process.join()
+
+           aggregator.stop()
+
+       Worker creates :class:`ProcessHandler` with the given channel and uses it in the loggers
+
+    :ivar handlers: Handlers to write records into
+    :type handlers: HandlerList
+    """
+
+    def __init__(self, handlers: list[LoggerHandler]):
+        """
+        :param handlers: Handlers to write records into
+        :type handlers: list[LoggerHandler]
+        """
+
+        self.handlers = HandlerList(handlers)
+
+        # records of the channels are decoded by their own readers (ids of the strings are per channel)
+        self._decoder  = BinaryDecoder()
+        self._frames   = {}
+        self._readers  = []
+        self._lock     = threading.Lock()
+        self._thread   = None
+        self._running  = False
+
+        # wakes up the thread, when channels are changed or aggregator is stopping
+        self._wakeup_reader, self._wakeup_writer = multiprocessing.Pipe(duplex=False)
+
+    def open_channel(self) -> Connection:
+        """Opens new channel for a worker process
+
+        Main process can close its copy of the channel after start of the worker. Reader end is
+        closed by the aggregator when all copies of the write end are closed
+
+        :returns: Write end of the channel. Pass it to the worker process and create :class:`ProcessHandler` with it
+        :rtype: Connection
+        """
+
+        reader, writer = multiprocessing.Pipe(duplex=False)
+
+        with self._lock:
+            self._readers.append(reader)
+
+        self._wakeup_writer.send_bytes(b'')
+        return writer
+
+    def start(self):
+        """Starts the aggregator thread"""
+
+        self._running  = True
+        self._thread   = threading.Thread(target=self._run, name='ezlog-aggregator', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Writes all received records, stops the aggregator thread and flushes the handlers.
+           Workers should be finished before this call
+        """
+
+        self._running = False
+        self._wakeup_writer.send_bytes(b'')
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        for h in self.handlers:
+            h.flush()
+
+    def _dispatch(self, conn: Connection, data: bytes):
+        if data[:1] == _TEXT:
+            level, = _HEADER.unpack_from(data, 1)
+            text = data[1 + _HEADER.size:].decode('utf-8')
+
+            for h in self.handlers:
+                if h.log_level <= level:
+                    h.handle(text, level)
+            return
+
+        frames = self._frames.get(conn)
+
+        if frames is None:
+            frames = self._frames[conn] = _FrameReader()
+
+        stream = io.BytesIO(data)
+        stream.seek(1)
+
+        records = [self._decoder.record(r) for r in frames.read(stream)]
+
+        for h in self.handlers:
+            accepted = [r for r in records if h.log_level <= r.level]
+
+            try:
+                if len(accepted) == 1:
+                    h.emit(accepted[0])
+                elif accepted:
+                    h.emit_many(accepted)
+
+            except Exception:
+                # other handlers get the records anyway
+                _report_error(f'records of the {type(h).__name__} are dropped')
+
+    def _receive(self, timeout: float | None) -> bool:
+        """Receives and dispatches records from the ready channels
+
+        :param timeout: Timeout of waiting
+        :type timeout: float | None
+
+        :returns: True if any record was received
+        """
+
+        with self._lock:
+            readers = list(self._readers)
+
+        received = False
+
+        for conn in multiprocessing.connection.wait(readers + [self._wakeup_reader], timeout):
+            if conn is self._wakeup_reader:
+                conn.recv_bytes()
+                continue
+
+            try:
+                data = conn.recv_bytes()
+
+            except EOFError:
+                # worker closed the channel
+                with self._lock:
+                    self._readers.remove(conn)
+
+                self._frames.pop(conn, None)
+                conn.close()
+                continue
+
+            received = True
+
+            try:
+                self._dispatch(conn, data)
+
+            except Exception:
+                # aggregator keeps reading, so workers aren't blocked by the full pipes
+                _report_error('records of the worker are dropped')
+
+        return received
+
+    def _run(self):
+        while self._running:
+            self._receive(None)
+
+        # drain records, sent before the stop
+        while self._receive(0):
+            pass
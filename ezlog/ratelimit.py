@@ -0,0 +1,323 @@
+"""
+Rate limiting of the records. Limits records of the call sites by token buckets,
+samples records of the chosen levels and collapses repeated records.
+Decisions are made before any formatting of the record
+"""
+
+import atexit
+import random
+import threading
+import time
+import typing
+import weakref
+
+from ._types import LogLevelType
+from .utils import LogLevel, CallerInfo, name_to_level
+
+# handlers register their exit flush before the limiters, so it runs after the last reports (atexit is LIFO)
+from .handlers import _report_error
+
+if typing.TYPE_CHECKING:
+    from .logger import Logger
+
+__all__ = ['RateLimiter']
+
+
+class _Site:
+    """State of the call site"""
+
+    __slots__ = ('logger', 'message', 'caller', 'level', 'tokens', 'updated', 'seen',
+                 'limited', 'sampled', 'repeated', 'last_args')
+
+    def __init__(self, logger: 'Logger', message: str, caller: typing.Any, level: int, tokens: float, now: float):
+        self.logger     = logger
+        self.message    = message
+        self.caller     = caller
+        self.level      = level
+        self.tokens     = tokens
+        self.updated    = now
+        self.seen       = now
+        self.limited    = 0
+        self.sampled    = 0
+        self.repeated   = 0
+        self.last_args  = None
+
+
+class RateLimiter:
+    """Limits records of the loggers. Call site is a line of the log call (file:line)
+       and a message template, so different messages of the same line are limited separately.
+
+       * ``rate`` - records per second of the call site (token bucket with ``burst`` capacity).
+         Records of the ``exempt_level`` or higher aren't limited
+       * ``sampling`` - probability of the record to be written, by levels
+       * ``collapse_duplicates`` - consecutive records of the call site with equal arguments
+         are counted, instead of writing
+
+       Counters of the suppressed records are written as records of the ``report_level``
+       every ``report_interval`` seconds by the background thread (shared by all limiters).
+       Without ``periodic_reports`` they are written by the next record passed to the limiter instead.
+       Reports are written by :meth:`report` and at interpreter exit too.
+       Call sites without records for ``report_interval`` are forgotten by the reports
+
+       Example::
+
+           limiter = RateLimiter(rate=10, burst=50, sampling={'debug': 0.01}, collapse_duplicates=True)
+           group = LoggerGroup('Example', handlers=[StdoutHandler()], rate_limiter=limiter)
+
+    :ivar rate: Records per second of the call site (None - no limit)
+    :type rate: float | None
+    :ivar burst: Capacity of the token bucket
+    :type burst: float
+    :ivar sampling: Probability of the record to be written, by levels
+    :type sampling: dict[int, float]
+    :ivar collapse_duplicates: Collapse consecutive records of the call site with equal arguments
+    :type collapse_duplicates: bool
+    :ivar report_interval: Interval of the suppression reports in seconds
+    :type report_interval: float
+    :ivar report_level: Level of the suppression reports
+    :type report_level: int
+    :ivar exempt_level: Min level of the records, that aren't limited by rate
+    :type exempt_level: int | float
+    :ivar periodic_reports: Reports are written by the background thread
+    :type periodic_reports: bool
+    """
+
+    def __init__(self,
+                 rate: float | None = None,
+                 burst: float | None = None,
+                 sampling: dict[LogLevelType, float] | None = None,
+                 collapse_duplicates: bool = False,
+                 report_interval: float = 10.0,
+                 report_level: LogLevelType = LogLevel.WARNING,
+                 exempt_level: LogLevelType | None = LogLevel.CRITICAL,
+                 periodic_reports: bool = True):
+        """
+        :param rate: Records per second of the call site (None - no limit)
+        :type rate: float | None
+        :param burst: Capacity of the token bucket (max records in a burst). Equals to rate by default
+        :type burst: float | None
+        :param sampling: Probability (0.0 - 1.0) of the record to be written, by levels
+        :type sampling: dict[LogLevelType, float] | None
+        :param collapse_duplicates: Collapse consecutive records of the call site with equal arguments
+                                    into the "repeated N times" report
+        :type collapse_duplicates: bool
+        :param report_interval: Interval of the suppression reports in seconds
+        :type report_interval: float
+        :param report_level: Level of the suppression reports
+        :type report_level: LogLevelType
+        :param exempt_level: Min level of the records, that aren't limited by rate (None - all are limited)
+        :type exempt_level: LogLevelType | None
+        :param periodic_reports: Write reports by the background thread every ``report_interval``
+                                 (otherwise, by the first record after the interval)
+        :type periodic_reports: bool
+        """
+
+        self.rate                 = rate
+        self.burst                = float(burst if burst is not None else max(rate or 1, 1))
+        self.sampling             = {name_to_level(level): p for level, p in (sampling or {}).items()}
+        self.collapse_duplicates  = collapse_duplicates
+        self.report_interval      = report_interval
+        self.report_level         = name_to_level(report_level)
+        self.exempt_level         = name_to_level(exempt_level) if exempt_level is not None else float('inf')
+        self.periodic_reports     = periodic_reports
+
+        self._sites        = {}
+        self._lock         = threading.Lock()
+        self._next_report  = time.monotonic() + report_interval
+
+        _reporter.register(self)
+
+    def allow(self, logger: 'Logger', level: int, message: str, args: tuple, caller: typing.Any) -> bool:
+        """Decides if the record should be written. Called by the logger before formatting
+
+        :param logger: Logger of the record
+        :type logger: Logger
+        :param level: Level of the record
+        :type level: int
+        :param message: Message template
+        :type message: str
+        :param args: Arguments of the message
+        :type args: tuple
+        :param caller: Information about caller of the log function
+        :type caller: CallerInfo
+
+        :returns: True if the record should be written
+        :rtype: bool
+        """
+
+        now      = time.monotonic()
+        key      = (logger, caller.code if type(caller) is CallerInfo else caller.filename, caller.lineno, message)
+        reports  = None
+        allowed  = True
+
+        with self._lock:
+            site = self._sites.get(key)
+
+            if site is None:
+                site = self._sites[key] = _Site(logger, message, caller, level, self.burst, now)
+
+            if self.collapse_duplicates:
+                if site.last_args is not None and _equal(site.last_args, args):
+                    site.repeated += 1
+                    allowed = False
+
+                else:
+                    if site.repeated:
+                        # streak of duplicates is over
+                        reports = [self._take_report(site)]
+
+                    site.last_args = args
+
+            if allowed:
+                probability = self.sampling.get(level)
+
+                if probability is not None and random.random() >= probability:
+                    site.sampled += 1
+                    allowed = False
+
+            if allowed and self.rate is not None and level < self.exempt_level:
+                tokens = min(self.burst, site.tokens + (now - site.updated) * self.rate)
+                site.updated = now
+
+                if tokens < 1:
+                    site.tokens   = tokens
+                    site.limited += 1
+                    allowed = False
+
+                else:
+                    site.tokens = tokens - 1
+
+            site.level  = level
+            site.seen   = now
+
+            if now >= self._next_report:
+                reports = (reports or []) + self._take_reports(now)
+
+        if reports:
+            self._write_reports(reports)
+
+        return allowed
+
+    def report(self):
+        """Writes counters of the suppressed records immediately"""
+
+        with self._lock:
+            reports = self._take_reports(time.monotonic())
+
+        self._write_reports(reports)
+
+    def _take_reports(self, now: float) -> list[tuple]:
+        """Collects and resets counters of all call sites, forgets idle sites (under the lock)"""
+
+        self._next_report = now + self.report_interval
+
+        reports = []
+
+        for key, site in list(self._sites.items()):
+            if site.limited or site.sampled or site.repeated:
+                reports.append(self._take_report(site))
+
+            elif self._idle(site, now):
+                # site keeps the logger and the message, so messages with inlined values would grow the sites
+                del self._sites[key]
+
+        return reports
+
+    def _idle(self, site: _Site, now: float) -> bool:
+        """Checks if the site has no records for the report interval and its token bucket is full,
+           so the new site of the same call would act the same
+        """
+
+        if now - site.seen < self.report_interval:
+            return False
+
+        return self.rate is None or site.tokens + (now - site.updated) * self.rate >= self.burst
+
+    @staticmethod
+    def _take_report(site: _Site) -> tuple:
+        report = (site, site.limited, site.sampled, site.repeated)
+        site.limited = site.sampled = site.repeated = 0
+
+        return report
+
+    def _write_reports(self, reports: list[tuple]):
+        for site, limited, sampled, repeated in reports:
+            if limited or sampled:
+                site.logger.dispatch(self.report_level,
+                                     'Suppressed {} records of "{}" ({} rate limited, {} sampled, {} repeated)',
+                                     (limited + sampled + repeated, site.message, limited, sampled, repeated),
+                                     site.caller)
+            else:
+                site.logger.dispatch(site.level, 'Previous message "{}" repeated {} times',
+                                     (site.message, repeated), site.caller)
+
+
+def _equal(a: tuple, b: tuple) -> bool:
+    """Compares arguments of the records (arguments with broken ``__eq__`` are not equal)"""
+
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+class _ReportTimer:
+    """Background thread, that writes reports of the limiters after their ``report_interval``"""
+
+    def __init__(self):
+        self.limiters  = weakref.WeakSet()
+        self.event     = threading.Event()
+        self.thread    = None
+        self.lock      = threading.Lock()
+
+    def register(self, limiter: RateLimiter):
+        """Registers the limiter (to write its reports by interval and at exit)
+
+        :param limiter: Rate limiter
+        :type limiter: RateLimiter
+        """
+
+        with self.lock:
+            self.limiters.add(limiter)
+
+            if limiter.periodic_reports and self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='ezlog-reporter', daemon=True)
+                self.thread.start()
+
+        # thread recalculates the nearest report time
+        self.event.set()
+
+    def run(self):
+        while True:
+            self.event.clear()
+
+            timeout  = None
+            now      = time.monotonic()
+
+            for limiter in list(self.limiters):
+                if not limiter.periodic_reports:
+                    continue
+
+                if limiter._next_report <= now:
+                    try:
+                        limiter.report()
+                    except Exception:
+                        _report_error('reports of the rate limiter are dropped')
+
+                # report time is moved by the report (or by the records of the limiter)
+                wait = max(limiter._next_report - now, 0.001)
+
+                if timeout is None or wait < timeout:
+                    timeout = wait
+
+            self.event.wait(timeout)
+
+    def report_all(self):
+        """Writes reports of all limiters"""
+
+        for limiter in list(self.limiters):
+            limiter.report()
+
+
+_reporter = _ReportTimer()
+atexit.register(_reporter.report_all)
@@ -0,0 +1,650 @@
+"""
+Reader of the ezlog text logs. Streams files via ``mmap``, parses records by the layout of the formatter
+and queries them by time, level, group and logger name. Optional sidecar index (``<file>.ezidx``)
+allows skipping blocks of the file, that can't contain matching records.
+
+Usage::
+
+    python -m ezlog.reader app.log --level ERROR --group Example.Groups --since 10:00 --until 10:05
+    python -m ezlog.reader app.log --index   # build or update the index only
+"""
+
+import _string
+import argparse
+import gzip
+import json
+import lzma
+import mmap
+import os
+import re
+import sys
+import typing
+
+from .defaults import DEFAULT_FORMATTER, DEFAULT_TIME_FORMATTER
+from .utils import level_names, rotated_segments
+
+__all__ = ['TIME_FIELDS', 'LineLayout', 'LogEntry', 'LogIndex', 'LogReader', 'rotated_segments', 'parse_time', 'main']
+
+TIME_FIELDS = ('year', 'month', 'day', 'hour', 'minute', 'second')
+"""Fields of the time formatter, that make the time key of the record"""
+
+# fields of the formatter, that are parsed into the LogEntry
+_FIELDS = {
+    'time':            'time',
+    'level':           'level',
+    'group_name':      'group_name',
+    'name':            'name',
+    'message':         'message',
+    'stack.lineno':    'lineno',
+    'stack.function':  'function',
+}
+
+_ANSI = re.compile(rb'\x1b\[[0-9;]*m')
+
+_COMPRESSED = {'.gz': gzip.open, '.xz': lzma.open}
+
+TimeKey = tuple[int, ...]
+
+
+class LineLayout:
+    """Regex of the first line of the record, made from the formatter and the time formatter
+
+    :ivar pattern: Compiled regex (bytes)
+    :type pattern: re.Pattern
+    :ivar time_fields: Names of the time fields present in the time formatter (order of the time key)
+    :type time_fields: tuple[str, ...]
+    """
+
+    def __init__(self, formatter: str = DEFAULT_FORMATTER, time_formatter: str = DEFAULT_TIME_FORMATTER):
+        """
+        :param formatter: Formatter of the log records
+        :type formatter: str
+        :param time_formatter: Formatter of the time
+        :type time_formatter: str
+        """
+
+        self.time_fields = tuple(f for f in TIME_FIELDS
+                                 if any(name == f for _, name, _, _ in _string.formatter_parser(time_formatter)))
+
+        time_regex = self._regex(time_formatter, lambda name: r'\d+' if name in TIME_FIELDS or name == 'microsecond'
+                                 else '.*?', time=True)
+
+        def field_regex(name: str) -> str:
+            if name == 'time':
+                return time_regex
+            if name == 'stack.lineno':
+                return r'\d+'
+            if name == 'message':
+                return '.*'
+            return '.*?'
+
+        self.pattern = re.compile(('^' + self._regex(formatter, field_regex) + '$').encode('utf-8'))
+
+    @staticmethod
+    def _regex(template: str, field_regex: typing.Callable[[str], str], time: bool = False) -> str:
+        parts = []
+
+        for literal, name, spec, _ in _string.formatter_parser(template):
+            parts.append(re.escape(literal))
+
+            if name is None:
+                continue
+
+            group = f'(?P<{name}>' if time and name in TIME_FIELDS else \
+                    f'(?P<{_FIELDS[name]}>' if not time and name in _FIELDS else '(?:'
+
+            regex = group + field_regex(name) + ')'
+
+            # aligned fields are padded by spaces
+            if '<' in spec or (spec[:1].isdigit() and not spec.endswith(('d', 's'))):
+                regex += ' *'
+            elif '>' in spec or '^' in spec:
+                regex = ' *' + regex + (' *' if '^' in spec else '')
+
+            parts.append(regex)
+
+        return ''.join(parts)
+
+    def match(self, line: bytes) -> dict[str, bytes] | None:
+        """Parses first line of the record
+
+        :param line: Line without the line end
+        :type line: bytes
+
+        :returns: Parsed fields or None, if line isn't first line of the record
+        """
+
+        if b'\x1b' in line:
+            line = _ANSI.sub(b'', line)
+
+        m = self.pattern.match(line)
+
+        return m.groupdict() if m is not None else None
+
+    def time_key(self, fields: dict[str, bytes]) -> TimeKey:
+        """Makes comparable time key of the parsed record
+
+        :param fields: Parsed fields
+        :type fields: dict[str, bytes]
+
+        :returns: Tuple of the time fields
+        """
+        return tuple(int(fields[f]) for f in self.time_fields)
+
+
+class LogEntry:
+    """Record of the log file
+
+    :ivar offset: Offset of the record in the file (decompressed stream for the compressed segments)
+    :type offset: int
+    :ivar time_key: Time key (see :attr:`LineLayout.time_fields`)
+    :type time_key: tuple[int, ...]
+    :ivar fields: Parsed fields of the first line (time, level, group_name, name, message, lineno, function)
+    :type fields: dict[str, str]
+    :ivar text: Full text of the record (with traceback lines)
+    :type text: str
+    """
+
+    __slots__ = ('offset', 'time_key', 'fields', 'text')
+
+    def __init__(self, offset: int, time_key: TimeKey, fields: dict[str, str], text: str):
+        self.offset    = offset
+        self.time_key  = time_key
+        self.fields    = fields
+        self.text      = text
+
+    def __getattr__(self, name: str) -> str:
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        return f'LogEntry(offset={self.offset}, fields={self.fields!r})'
+
+
+class LogIndex:
+    """Sidecar index of the log file. File is split into blocks (by records), for every block
+       are stored its offset, time range and postings (block ids) of levels, groups and loggers.
+       Records aren't always written in time order (buffers of the threads, queues, aggregators),
+       so time range of the block is the min and max time key of its records
+
+    :ivar path: Path to the index
+    :type path: str
+    :ivar size: Indexed size of the log file (offset after the last indexed block)
+    :type size: int
+    :ivar blocks: Blocks: [offset, min time key, max time key]
+    :type blocks: list[list]
+    :ivar postings: ``{'level' | 'group_name' | 'name': {value: [block ids]}}``
+    :type postings: dict[str, dict[str, list[int]]]
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str):
+        """
+        :param path: Path to the index
+        :type path: str
+        """
+
+        self.path      = path
+        self.size      = 0
+        self.head      = ''
+        self.blocks    = []
+        self.postings  = {'level': {}, 'group_name': {}, 'name': {}}
+
+    @classmethod
+    def load(cls, path: str) -> typing.Optional['LogIndex']:
+        """Loads index from the file
+
+        :param path: Path to the index
+        :type path: str
+
+        :returns: Loaded index or None if it doesn't exist or has other version
+        """
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != cls.VERSION:
+            return None
+
+        index = cls(path)
+
+        index.size      = data['size']
+        index.head      = data['head']
+        index.blocks    = data['blocks']
+        index.postings  = data['postings']
+
+        return index
+
+    def save(self):
+        """Saves index to its file"""
+
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'version':   self.VERSION,
+                       'size':      self.size,
+                       'head':      self.head,
+                       'blocks':    self.blocks,
+                       'postings':  self.postings}, f, separators=(',', ':'))
+
+        os.replace(self.path + '.tmp', self.path)
+
+    def add_block(self, offset: int, low: TimeKey, high: TimeKey, values: dict[str, set[str]]):
+        """Adds block to the index
+
+        :param offset: Offset of the block
+        :type offset: int
+        :param low: Min time key of the records
+        :type low: tuple[int, ...]
+        :param high: Max time key of the records
+        :type high: tuple[int, ...]
+        :param values: Levels, groups and loggers of the block records
+        :type values: dict[str, set[str]]
+        """
+
+        block_id = len(self.blocks)
+        self.blocks.append([offset, list(low), list(high)])
+
+        for field, found in values.items():
+            postings = self.postings[field]
+
+            for value in found:
+                postings.setdefault(value, []).append(block_id)
+
+    def candidate_blocks(self, since: TimeKey | None, until: TimeKey | None,
+                         filters: dict[str, typing.Callable[[str], bool]]) -> list[int]:
+        """Selects blocks, that can contain matching records
+
+        :param since: Min time key
+        :type since: tuple[int, ...] | None
+        :param until: Max time key (inclusive, prefix of the key is compared)
+        :type until: tuple[int, ...] | None
+        :param filters: Predicates of the field values
+        :type filters: dict[str, Callable[[str], bool]]
+
+        :returns: Sorted ids of the blocks
+        """
+
+        selected = None
+
+        for field, predicate in filters.items():
+            ids = set()
+
+            for value, block_ids in self.postings[field].items():
+                if predicate(value):
+                    ids.update(block_ids)
+
+            selected = ids if selected is None else selected & ids
+
+        candidates = range(len(self.blocks)) if selected is None else sorted(selected)
+
+        return [i for i in candidates
+                if (since is None or tuple(self.blocks[i][2]) >= since) and
+                   (until is None or tuple(self.blocks[i][1][:len(until)]) <= until)]
+
+
+class LogReader:
+    """Reads and queries ezlog text log (plain or compressed by ``gzip``/``lzma``)
+
+    :ivar path: Path to the log
+    :type path: str
+    :ivar layout: Layout of the records
+    :type layout: LineLayout
+    """
+
+    def __init__(self, path: str, layout: LineLayout | None = None, block_size: int = 1 << 20):
+        """
+        :param path: Path to the log
+        :type path: str
+        :param layout: Layout of the records (default formatters by default)
+        :type layout: LineLayout | None
+        :param block_size: Approximate size of the index block in bytes
+        :type block_size: int
+        """
+
+        self.path        = path
+        self.layout      = layout if layout is not None else LineLayout()
+        self.block_size  = block_size
+
+    @property
+    def compressed(self) -> bool:
+        """Log is compressed (it can't be mapped and indexed)"""
+        return os.path.splitext(self.path)[1] in _COMPRESSED
+
+    @property
+    def index_path(self) -> str:
+        """Path to the sidecar index"""
+        return self.path + '.ezidx'
+
+    def _lines(self, start: int = 0) -> typing.Iterator[tuple[int, bytes]]:
+        """Iterates over lines (offset, line without line end) from the given offset"""
+
+        if self.compressed:
+            offset = 0
+
+            with _COMPRESSED[os.path.splitext(self.path)[1]](self.path, 'rb') as f:
+                for line in f:
+                    yield offset, line.rstrip(b'\r\n')
+                    offset += len(line)
+
+            return
+
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= start:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                size    = len(m)
+                offset  = start
+
+                while offset < size:
+                    end = m.find(b'\n', offset)
+
+                    if end == -1:
+                        end = size
+
+                    yield offset, m[offset:end].rstrip(b'\r')
+                    offset = end + 1
+
+    def _records(self, start: int = 0, stop: int | None = None) \
+            -> typing.Iterator[tuple[int, dict[str, bytes], list[bytes]]]:
+        """Iterates over records (offset, parsed fields, lines) in the range of offsets"""
+
+        current = None
+
+        for offset, line in self._lines(start):
+            fields = self.layout.match(line)
+
+            if fields is not None:
+                if current is not None:
+                    yield current
+
+                if stop is not None and offset >= stop:
+                    return
+
+                current = (offset, fields, [line])
+
+            elif current is not None:
+                # continuation line (traceback)
+                current[2].append(line)
+
+        if current is not None:
+            yield current
+
+    def build_index(self) -> LogIndex:
+        """Builds or updates (if the log was appended) the sidecar index
+
+        :returns: Index of the log
+        :rtype: LogIndex
+
+        :raises ValueError: When log is compressed
+        """
+
+        if self.compressed:
+            raise ValueError('Compressed logs can not be indexed')
+
+        size = os.path.getsize(self.path)
+
+        with open(self.path, 'rb') as f:
+            head = f.read(256).decode('utf-8', 'replace')
+
+        index = LogIndex.load(self.index_path)
+
+        # log was rewritten
+        if index is None or index.size > size or not head.startswith(index.head):
+            index  = LogIndex(self.index_path)
+            saved  = None
+        else:
+            saved  = (index.size, index.head)
+
+        index.head = head
+
+        block_offset  = None
+        low = high    = None
+        values        = {'level': set(), 'group_name': set(), 'name': set()}
+        end           = index.size
+
+        for offset, fields, lines in self._records(index.size):
+            if block_offset is not None and offset - block_offset >= self.block_size:
+                index.add_block(block_offset, low, high, values)
+                index.size = offset
+
+                block_offset, values = None, {'level': set(), 'group_name': set(), 'name': set()}
+
+            key = self.layout.time_key(fields)
+
+            if block_offset is None:
+                block_offset, low, high = offset, key, key
+            elif key < low:
+                low = key
+            elif key > high:
+                high = key
+
+            for field, found in values.items():
+                if field in fields:
+                    found.add(fields[field].decode('utf-8', 'replace').rstrip())
+
+            end = offset + sum(len(line) + 1 for line in lines)
+
+        if block_offset is not None:
+            index.add_block(block_offset, low, high, values)
+            index.size = min(end, size)
+
+        # index of not appended log isn't rewritten
+        if (index.size, index.head) != saved:
+            index.save()
+
+        return index
+
+    def query(self,
+              since: TimeKey | None = None,
+              until: TimeKey | None = None,
+              levels: typing.Collection[str] | None = None,
+              groups: typing.Collection[str] | None = None,
+              names: typing.Collection[str] | None = None,
+              pattern: str | None = None,
+              use_index: bool = True) -> typing.Iterator[LogEntry]:
+        """Queries records of the log
+
+        :param since: Min time key of the record (see :attr:`LineLayout.time_fields`)
+        :type since: tuple[int, ...] | None
+        :param until: Max time key of the record (inclusive, prefix of the key is compared)
+        :type until: tuple[int, ...] | None
+        :param levels: Names of the levels
+        :type levels: Collection[str] | None
+        :param groups: Full names of the groups (child groups are matched too)
+        :type groups: Collection[str] | None
+        :param names: Names of the loggers
+        :type names: Collection[str] | None
+        :param pattern: Regex, that must be found in the message
+        :type pattern: str | None
+        :param use_index: Use sidecar index (it is built or updated, if required)
+        :type use_index: bool
+
+        :returns: Iterator over the matching records
+        """
+
+        filters = {}
+
+        if levels:
+            levels = {level.upper() for level in levels}
+            filters['level'] = levels.__contains__
+
+        if groups:
+            groups = tuple(groups)
+            filters['group_name'] = lambda g: any(g == p or g.startswith(p + '.') for p in groups)
+
+        if names:
+            filters['name'] = set(names).__contains__
+
+        message_re = re.compile(pattern) if pattern is not None else None
+
+        if use_index and not self.compressed:
+            index   = self.build_index()
+            ranges  = self._block_ranges(index, index.candidate_blocks(since, until, filters))
+
+            # not indexed tail of the log
+            ranges.append((index.size, None))
+        else:
+            ranges = [(0, None)]
+
+        for start, stop in ranges:
+            for offset, fields, lines in self._records(start, stop):
+                key = self.layout.time_key(fields)
+
+                if since is not None and key < since:
+                    continue
+
+                # records aren't always written in time order, so the scan goes on
+                if until is not None and key[:len(until)] > until:
+                    continue
+
+                decoded = {k: v.decode('utf-8', 'replace').rstrip() if k != 'message' else v.decode('utf-8', 'replace')
+                           for k, v in fields.items()}
+
+                if any(not predicate(decoded.get(field, '')) for field, predicate in filters.items()):
+                    continue
+
+                if message_re is not None and not message_re.search(decoded.get('message', '')):
+                    continue
+
+                yield LogEntry(offset, key, decoded, b'\n'.join(lines).decode('utf-8', 'replace'))
+
+    @staticmethod
+    def _block_ranges(index: LogIndex, block_ids: list[int]) -> list[tuple[int, int]]:
+        """Merges adjacent blocks into ranges of offsets"""
+
+        ranges = []
+
+        for i in block_ids:
+            start  = index.blocks[i][0]
+            stop   = index.blocks[i + 1][0] if i + 1 < len(index.blocks) else index.size
+
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+
+        return ranges
+
+    def first_time_key(self) -> TimeKey | None:
+        """Returns time key of the first record (None if log is empty)"""
+
+        for _, fields, _ in self._records():
+            return self.layout.time_key(fields)
+
+        return None
+
+
+def parse_time(value: str, reference: TimeKey | None) -> TimeKey:
+    """Parses time of the query: ``YYYY.MM.DD HH:MM[:SS]``, ``YYYY-MM-DD HH:MM[:SS]`` or ``HH:MM[:SS]``
+       (date is taken from the reference)
+
+    :param value: Time to parse
+    :type value: str
+    :param reference: Time key of the first record of the log
+    :type reference: tuple[int, ...] | None
+
+    :returns: Time key
+    :raises ValueError: When time has unknown format
+    """
+
+    numbers = [int(n) for n in re.findall(r'\d+', value)]
+
+    if len(numbers) < 2 or len(numbers) > 6:
+        raise ValueError(f'Unknown time format "{value}"')
+
+    if len(numbers) <= 3 and ':' in value:
+        # time only
+        numbers = list((reference or (0, 0, 0))[:3]) + numbers
+
+    return tuple(numbers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the ``python -m ezlog.reader``
+
+    :param argv: Command line arguments
+    :type argv: list[str] | None
+
+    :returns: Exit code
+    :rtype: int
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m ezlog.reader', description='Queries ezlog text logs')
+    parser.add_argument('files', nargs='+', help='log files (plain, .gz or .xz)')
+    parser.add_argument('--since', help='min time: "YYYY.MM.DD HH:MM[:SS]" or "HH:MM[:SS]"')
+    parser.add_argument('--until', help='max time (inclusive)')
+    parser.add_argument('--level', action='append', help='level name (can be repeated)')
+    parser.add_argument('--min-level', help='min level name')
+    parser.add_argument('--group', action='append', help='group full name, child groups match too (can be repeated)')
+    parser.add_argument('--name', action='append', help='logger name (can be repeated)')
+    parser.add_argument('--grep', help='regex to search in the message')
+    parser.add_argument('--rotated', action='store_true', help='include rotated segments of the files')
+    parser.add_argument('--no-index', action='store_true', help='scan files without the sidecar index')
+    parser.add_argument('--index', action='store_true', help='only build or update the indexes')
+    parser.add_argument('--count', action='store_true', help='print count of the matching records only')
+
+    args = parser.parse_args(argv)
+
+    levels = set(args.level or ())
+
+    if args.min_level:
+        by_name = {v: k for k, v in level_names.items()}
+
+        if args.min_level.upper() not in by_name:
+            parser.error(f'unknown level "{args.min_level}"')
+
+        levels |= {name for level, name in level_names.items() if level >= by_name[args.min_level.upper()]}
+
+    paths = []
+
+    for path in args.files:
+        if args.rotated:
+            paths.extend(rotated_segments(path))
+        paths.append(path)
+
+    count = 0
+
+    try:
+        for path in paths:
+            reader = LogReader(path)
+
+            if args.index:
+                if not reader.compressed:
+                    reader.build_index()
+                continue
+
+            reference  = reader.first_time_key() if args.since or args.until else None
+            since      = parse_time(args.since, reference) if args.since else None
+            until      = parse_time(args.until, reference) if args.until else None
+
+            for entry in reader.query(since, until, levels or None, args.group, args.name, args.grep,
+                                      use_index=not args.no_index):
+                count += 1
+
+                if not args.count:
+                    sys.stdout.write(entry.text + '\n')
+
+    except BrokenPipeError:
+        # output was closed (e.g. by ``head``)
+        sys.stderr.close()
+        return 0
+
+    except (OSError, ValueError, re.error) as e:
+        print(f'{parser.prog}: error: {e}', file=sys.stderr)
+        return 1
+
+    if args.count:
+        print(count)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
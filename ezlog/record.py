@@ -0,0 +1,242 @@
+"""
+Declares LogRecord - structured record, that is passed to the handlers
+"""
+
+import typing
+
+from .timeformat import get_time_renderer
+from .tracebacks import format_traceback
+from .lazy import Lazy, format_arg
+
+if typing.TYPE_CHECKING:
+    from .logger import Logger
+    from .utils import CallerInfo
+
+__all__ = ['LogRecord']
+
+
+class LogRecord:
+    """Record of the log. Keeps raw data of the log call, text is rendered only when a handler
+       requests it. Rendered texts are memoized, so handlers with the same settings share them
+
+    :ivar logger: Logger, that created this record (its settings are used for rendering)
+    :type logger: Logger
+    :ivar level: Level of the record
+    :type level: int
+    :ivar timestamp: Time of the record in nanoseconds since epoch
+    :type timestamp: int
+    :ivar name: Name of the logger
+    :type name: str
+    :ivar group_name: Full name of the logger group (``ezlog`` if logger hasn't group)
+    :type group_name: str
+    :ivar message: Message template
+    :type message: str
+    :ivar args: Arguments of the message
+    :type args: tuple
+    :ivar caller: Information about caller of the log function
+    :type caller: CallerInfo
+    :ivar exception: Exception to log (if any)
+    :type exception: Exception | None
+    """
+
+    __slots__ = ('logger', 'level', 'timestamp', 'name', 'group_name', 'message', 'args',
+                 'caller', 'exception', '_cache')
+
+    def __init__(self,
+                 logger: 'Logger',
+                 level: int,
+                 timestamp: int,
+                 message: str,
+                 args: tuple,
+                 caller: 'CallerInfo',
+                 exception: Exception | None = None):
+        """
+        :param logger: Logger, that created this record
+        :type logger: Logger
+        :param level: Level of the record
+        :type level: int
+        :param timestamp: Time of the record in nanoseconds since epoch
+        :type timestamp: int
+        :param message: Message template
+        :type message: str
+        :param args: Arguments of the message
+        :type args: tuple
+        :param caller: Information about caller of the log function
+        :type caller: CallerInfo
+        :param exception: Exception to log (if any)
+        :type exception: Exception | None
+        """
+
+        self.logger      = logger
+        self.level       = level
+        self.timestamp   = timestamp
+        self.name        = logger.name
+        self.group_name  = logger.group.group_link if logger.group is not None else 'ezlog'
+        self.message     = message
+        self.args        = args
+        self.caller      = caller
+        self.exception   = exception
+
+        # memoized texts
+        self._cache = {}
+
+    @property
+    def time_str(self) -> str:
+        """Time of the record, formatted by the time formatter of the logger"""
+
+        text = self._cache.get('time')
+
+        if text is None:
+            text = self._cache['time'] = get_time_renderer(self.logger.time_formatter, self.logger.clock).render(self.timestamp)
+
+        return text
+
+    @property
+    def values(self) -> tuple:
+        """Arguments with evaluated lazy ones (see :class:`ezlog.lazy.Lazy`)"""
+
+        values = self._cache.get('values')
+
+        if values is None:
+            args    = self.args
+            values  = self._cache['values'] = \
+                tuple([a.value if type(a) is Lazy else a for a in args]) if Lazy in map(type, args) else args
+
+        return values
+
+    @property
+    def args_str(self) -> list[str]:
+        """Arguments converted into the strings (once for all variants), cut by ``max_arg_length`` of the logger"""
+
+        args_str = self._cache.get('args_str')
+
+        if args_str is None:
+            limit = self.logger.max_arg_length
+
+            if limit is None:
+                args_str = self._cache['args_str'] = [str(o) for o in self.values]
+            else:
+                args_str = self._cache['args_str'] = [format_arg(o, limit) for o in self.values]
+
+        return args_str
+
+    def freeze(self):
+        """Converts arguments into the strings now. Records of the batches are rendered later,
+           so arguments, changed by the caller after the log call, must not change the output
+        """
+        self.args_str
+
+    @property
+    def text(self) -> str:
+        """Message formatted with the arguments (without formatter of the logger)"""
+
+        text = self._cache.get('text')
+
+        if text is None:
+            text = self._cache['text'] = self.logger.render_text(self)
+
+        return text
+
+    @property
+    def traceback_text(self) -> str:
+        """Formatted traceback of the exception without colors and the line end (empty if there is no exception).
+           Limits of the logger are applied, repeated tracebacks are taken from the cache (see :mod:`ezlog.tracebacks`)
+        """
+
+        text = self._cache.get('traceback')
+
+        if text is None:
+            text = self._cache['traceback'] = \
+                format_traceback(self.exception, self.logger.traceback_limit, self.logger.chain_limit) \
+                if self.exception is not None else ''
+
+        return text
+
+    def format_message(self, colors: bool = False) -> str:
+        """Returns the message line (by the formatter of the logger) without the line end
+
+        :param colors: Colored variant of the message
+        :type colors: bool
+
+        :returns: Formatted message
+        :rtype: str
+        """
+
+        key = ('message', colors)
+
+        text = self._cache.get(key)
+
+        if text is None:
+            text = self._cache[key] = self.logger.render_message(self, colors)
+
+        return text
+
+    def format_exception(self, colors: bool = False) -> str:
+        """Returns formatted traceback of the exception (empty string if there is no exception)
+
+        :param colors: Colored variant of the traceback
+        :type colors: bool
+
+        :returns: Formatted traceback with the line end
+        :rtype: str
+        """
+
+        key = ('exception', colors)
+
+        text = self._cache.get(key)
+
+        if text is None:
+            text = self._cache[key] = self.logger.render_exception(self, colors) if self.exception is not None else ''
+
+        return text
+
+    def render(self, colors: bool = False, exceptions: bool = True) -> str:
+        """Renders the record into the text, that is written by text handlers
+
+        :param colors: Colored variant of the record
+        :type colors: bool
+        :param exceptions: Add traceback of the exception
+        :type exceptions: bool
+
+        :returns: Rendered record with the line end
+        :rtype: str
+        """
+
+        key = ('render', colors, exceptions)
+
+        text = self._cache.get(key)
+
+        if text is None:
+            text = self.format_message(colors) + '\n'
+
+            if exceptions and self.exception is not None:
+                text += self.format_exception(colors)
+
+            self._cache[key] = text
+
+        return text
+
+    def render_bytes(self, colors: bool = False, exceptions: bool = True) -> memoryview:
+        """Renders the record and encodes it into UTF-8. Encoded variant is shared by all raw handlers
+           with the same settings (see :class:`ezlog.handlers.FileHandler`)
+
+        :param colors: Colored variant of the record
+        :type colors: bool
+        :param exceptions: Add traceback of the exception
+        :type exceptions: bool
+
+        :returns: Encoded record with the line end
+        :rtype: memoryview
+        """
+
+        key = ('bytes', colors, exceptions)
+
+        data = self._cache.get(key)
+
+        if data is None:
+            data = self._cache[key] = memoryview(self.render(colors, exceptions).encode('utf-8', 'surrogateescape'))
+
+        return data
+
+    def __repr__(self):
+        return f'LogRecord(name={self.name!r}, level={self.level}, message={self.message!r}, args={self.args!r})'
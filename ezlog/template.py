@@ -0,0 +1,208 @@
+"""
+Compiled string templates. Replacement of the ``str.format`` for the formatters and messages
+"""
+
+import _string
+import functools
+import keyword
+import typing
+
+__all__ = ['COLOR_FIELDS', 'CompiledTemplate', 'compile_template', 'message_template', 'uses_fields']
+
+COLOR_FIELDS = frozenset({'foreground', 'background', 'style', 'reset'})
+"""Fields of the colorama namespaces available in the templates"""
+
+
+class CompiledTemplate:
+    """Template, parsed once into a render function.
+       Result of the :meth:`render` is equal to the ``template.format(*args, **kwargs)``
+
+    :ivar template: Source template
+    :type template: str
+    :ivar fields: Names of the keyword fields used by the template (None if unknown)
+    :type fields: frozenset[str] | None
+    """
+
+    __slots__ = ('template', 'fields', 'render')
+
+    def __init__(self, template: str, compile: bool = True):
+        """
+        :param template: Template in the ``str.format`` syntax
+        :type template: str
+        :param compile: Compile the template (otherwise it is rendered via ``str.format``)
+        :type compile: bool
+        """
+
+        self.template = template
+
+        if not compile:
+            # template without fields uses no keyword fields
+            self.fields = None if '{' in template else frozenset()
+            self.render = self._render_format
+            return
+
+        try:
+            self.fields, self.render = _compile(template)
+
+        except (ValueError, SyntaxError, _Unsupported):
+            # let str.format do the work (and raise the same errors)
+            self.fields = None
+            self.render = self._render_format
+
+    def _render_format(self, args: tuple, kwargs: dict[str, typing.Any]) -> str:
+        return self.template.format(*args, **kwargs)
+
+    def __repr__(self):
+        return f'CompiledTemplate({self.template!r})'
+
+
+class _Unsupported(Exception):
+    """Raised when template can't be compiled (it is rendered via ``str.format`` then)"""
+
+
+def _compile(template: str) -> tuple[frozenset[str], typing.Callable[[tuple, dict], str]]:
+    """Compiles the template into a function, that formats f-string with the same fields
+
+    :param template: Template to compile
+    :type template: str
+
+    :returns: Names of the keyword fields and render function
+    """
+
+    consts  = {}
+    pieces  = []
+    fields  = set()
+
+    auto_index = 0
+    numbering  = None
+
+    def const(value: typing.Any) -> str:
+        name = f'_c{len(consts)}'
+        consts[name] = value
+        return name
+
+    for literal, field_name, spec, conversion in _string.formatter_parser(template):
+        if literal:
+            pieces.append('{' + const(literal) + '}')
+
+        if field_name is None:
+            continue
+
+        # nested replacement fields in the format spec
+        if '{' in spec:
+            raise _Unsupported
+
+        first, rest = _string.formatter_field_name_split(field_name)
+
+        if first == '':
+            if numbering == 'manual':
+                raise _Unsupported
+            numbering = 'auto'
+
+            expr = f'args[{auto_index}]'
+            auto_index += 1
+
+        elif isinstance(first, int):
+            if numbering == 'auto':
+                raise _Unsupported
+            numbering = 'manual'
+
+            expr = f'args[{first}]'
+
+        else:
+            fields.add(first)
+            expr = f'kwargs[{const(first)}]'
+
+        for is_attr, key in rest:
+            if is_attr:
+                if key.isidentifier() and not keyword.iskeyword(key):
+                    expr = f'{expr}.{key}'
+                else:
+                    expr = f'getattr({expr}, {const(key)})'
+            else:
+                expr = f'{expr}[{key if isinstance(key, int) else const(key)}]'
+
+        if conversion is not None:
+            expr += '!' + conversion
+
+        if spec:
+            expr += ':{' + const(spec) + '}'
+
+        pieces.append('{' + expr + '}')
+
+    if not pieces:
+        body = "''"
+    elif len(pieces) == 1 and pieces[0][1:-1] in consts:
+        body = pieces[0][1:-1]
+    else:
+        body = "f'" + ''.join(pieces) + "'"
+
+    namespace = dict(consts)
+    exec(f'def render(args, kwargs):\n    return {body}\n', namespace)
+
+    return frozenset(fields), namespace['render']
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """Compiles given template (result is cached per template)
+
+    :param template: Template in the ``str.format`` syntax
+    :type template: str
+
+    :returns: Compiled template
+    :rtype: CompiledTemplate
+    """
+
+    return CompiledTemplate(template)
+
+
+# messages, that were seen once (None) or compiled: message -> template
+_MESSAGES = {}
+
+# max count of the remembered messages (all are forgotten, when it is reached)
+_MAX_MESSAGES = 4096
+
+
+def message_template(message: str) -> CompiledTemplate:
+    """Returns template of the message. Message is compiled only when it is used again,
+       so messages with inlined values (f-strings) are rendered via ``str.format`` and don't pay
+       for the compilation (and don't push out compiled formatters from :func:`compile_template` cache)
+
+    :param message: Message in the ``str.format`` syntax
+    :type message: str
+
+    :returns: Compiled template or template, rendered via ``str.format``
+    :rtype: CompiledTemplate
+    """
+
+    template = _MESSAGES.get(message)
+
+    if template is not None:
+        return template
+
+    if message in _MESSAGES:
+        template = _MESSAGES[message] = CompiledTemplate(message)
+        return template
+
+    if len(_MESSAGES) >= _MAX_MESSAGES:
+        _MESSAGES.clear()
+
+    _MESSAGES[message] = None
+
+    return CompiledTemplate(message, compile=False)
+
+
+def uses_fields(template: CompiledTemplate, fields: frozenset[str]) -> bool:
+    """Checks if template uses any of the given keyword fields
+
+    :param template: Compiled template
+    :type template: CompiledTemplate
+    :param fields: Names of the fields
+    :type fields: frozenset[str]
+
+    :returns: True if any field is used (or template isn't compiled, so fields are unknown)
+    :rtype: bool
+    """
+
+    return template.fields is None or not template.fields.isdisjoint(fields)
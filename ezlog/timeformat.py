@@ -0,0 +1,175 @@
+"""
+Cached rendering of the record time. Date and time of the current second are rendered once,
+for every record is formatted only its sub-second part
+"""
+
+import _string
+import functools
+import time
+import typing
+
+from .template import compile_template
+
+__all__ = ['CLOCKS', 'TimeRenderer', 'get_time_renderer']
+
+
+def _coarse_clock() -> int:
+    return time.clock_gettime_ns(time.CLOCK_REALTIME_COARSE)
+
+
+def _make_monotonic_clock() -> typing.Callable[[], int]:
+    # wall time anchored once, then advanced by the monotonic clock
+    anchor = time.time_ns() - time.monotonic_ns()
+
+    def clock() -> int:
+        return anchor + time.monotonic_ns()
+
+    return clock
+
+
+CLOCKS: dict[str, typing.Callable[[], int]] = {
+    'wall':       time.time_ns,
+    'coarse':     _coarse_clock if hasattr(time, 'CLOCK_REALTIME_COARSE') else time.time_ns,
+    'monotonic':  _make_monotonic_clock()
+}
+"""Clock sources of the records time (functions, that return time since epoch in nanoseconds).
+
+* ``wall`` - ``time.time_ns()``, the system time
+* ``coarse`` - ``CLOCK_REALTIME_COARSE`` (Linux only, falls back to the ``wall``). Cheaper, but has resolution of the system tick
+* ``monotonic`` - system time at import, advanced by ``time.monotonic_ns()``. Isn't affected by the clock adjustments
+"""
+
+SUBSECOND_FIELDS = frozenset({'microsecond'})
+"""Fields of the time formatter, that change inside of one second"""
+
+
+class TimeRenderer:
+    """Renders time by the time formatter with cache of the current second.
+       Supports fields ``year``, ``month``, ``day``, ``hour``, ``minute``, ``second``
+       and ``microsecond`` (first 4 digits of the microseconds as string)
+
+    :ivar template: Time formatter
+    :type template: str
+    :ivar clock: Function, that returns time in nanoseconds
+    :type clock: Callable[[], int]
+    """
+
+    def __init__(self, template: str, clock: str | typing.Callable[[], int] = 'wall'):
+        """
+        :param template: Time formatter
+        :type template: str
+        :param clock: Name of the clock (see :data:`CLOCKS`) or function, that returns time in nanoseconds
+        :type clock: str | Callable[[], int]
+        """
+
+        self.template  = template
+        self.clock     = CLOCKS[clock] if isinstance(clock, str) else clock
+
+        # segments of the template: (is sub-second segment, compiled template)
+        self._segments = _split_template(template)
+
+        # (second, rendered segments). Replaced as a whole, so it is safe to read from any thread
+        self._cache = (None, ())
+
+    def render(self, timestamp_ns: int | None = None) -> str:
+        """Renders the time
+
+        :param timestamp_ns: Time since epoch in nanoseconds (current time of the clock if None)
+        :type timestamp_ns: int | None
+
+        :returns: Formatted time
+        :rtype: str
+        """
+
+        if timestamp_ns is None:
+            timestamp_ns = self.clock()
+
+        second, subsecond = divmod(timestamp_ns, 1_000_000_000)
+
+        cached_second, pieces = self._cache
+        if cached_second != second:
+            pieces = self._render_second(second)
+            self._cache = (second, pieces)
+
+        if isinstance(pieces, str):
+            return pieces
+
+        sub_kwargs = {'microsecond': str(subsecond // 1000)[:4]}
+
+        return ''.join([p if isinstance(p, str) else p.render((), sub_kwargs) for p in pieces])
+
+    def _render_second(self, second: int) -> str | tuple:
+        """Renders all segments, that don't depend on the sub-second time
+
+        :param second: Time since epoch in seconds
+        :type second: int
+
+        :returns: Rendered time (if there are no sub-second fields) or
+                  rendered strings and compiled sub-second templates
+        """
+
+        t = time.localtime(second)
+
+        kwargs = {'year':    t.tm_year,
+                  'month':   t.tm_mon,
+                  'day':     t.tm_mday,
+                  'hour':    t.tm_hour,
+                  'minute':  t.tm_min,
+                  'second':  t.tm_sec}
+
+        pieces = tuple(template if is_subsecond else template.render((), kwargs)
+                       for is_subsecond, template in self._segments)
+
+        if all(isinstance(p, str) for p in pieces):
+            return ''.join(pieces)
+
+        return pieces
+
+
+def _split_template(template: str) -> tuple:
+    """Splits time formatter into segments with and without sub-second fields
+
+    :param template: Time formatter
+    :type template: str
+
+    :returns: Tuple of (is sub-second segment, compiled template)
+    """
+
+    segments  = []
+    current   = []
+
+    for literal, field_name, spec, conversion in _string.formatter_parser(template):
+        current.append(literal.replace('{', '{{').replace('}', '}}'))
+
+        if field_name is None:
+            continue
+
+        field = '{' + field_name + (f'!{conversion}' if conversion else '') + (f':{spec}' if spec else '') + '}'
+
+        if _string.formatter_field_name_split(field_name)[0] in SUBSECOND_FIELDS:
+            segments.append((False, compile_template(''.join(current))))
+            segments.append((True, compile_template(field)))
+            current = []
+        else:
+            current.append(field)
+
+    segments.append((False, compile_template(''.join(current))))
+
+    # empty segments are useless
+    return tuple(s for s in segments if s[0] or s[1].template)
+
+
+@functools.lru_cache(maxsize=64)
+def get_time_renderer(template: str, clock: str = 'wall') -> TimeRenderer:
+    """Returns shared time renderer for given time formatter and clock
+
+    :param template: Time formatter
+    :type template: str
+    :param clock: Name of the clock (see :data:`CLOCKS`)
+    :type clock: str
+
+    :returns: Time renderer
+    :rtype: TimeRenderer
+    """
+
+    return TimeRenderer(template, clock)
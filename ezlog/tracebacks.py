@@ -0,0 +1,188 @@
+"""
+Formatting of the exceptions tracebacks. Formatted tracebacks are kept in the bounded LRU cache,
+so the same exception (same type, message and chain of the frames and instructions), logged repeatedly
+(e.g. by a retry loop), is formatted only once
+"""
+
+import builtins
+import collections
+import threading
+import typing
+
+__all__ = ['TracebackCache', 'TRACEBACK_CACHE', 'format_traceback']
+
+# exception groups (Python 3.11+)
+_EXCEPTION_GROUP = getattr(builtins, 'BaseExceptionGroup', ())
+
+
+def _chained(exception: typing.Any) -> typing.Any:
+    """Returns exception, that is printed before the given one in the traceback
+       (works for the exceptions and for the ``TracebackException`` too)
+    """
+
+    if exception.__cause__ is not None:
+        return exception.__cause__
+
+    return None if exception.__suppress_context__ else exception.__context__
+
+
+def _cache_key(exception: BaseException, limit: int | None, chain_limit: int | None) -> tuple | None:
+    """Makes key of the traceback: types, messages, notes and frames (code, line, instruction) of the chained exceptions.
+       Returns None, if the traceback can't be cached
+    """
+
+    chain  = []
+    seen   = set()
+    exc    = exception
+
+    while exc is not None and id(exc) not in seen:
+        # sub-exceptions of the groups aren't walked
+        if isinstance(exc, _EXCEPTION_GROUP):
+            return None
+
+        seen.add(id(exc))
+
+        frames  = []
+        tb      = exc.__traceback__
+
+        while tb is not None:
+            # instruction selects position markers (``^^^``) of the line
+            frames.append((tb.tb_frame.f_code, tb.tb_lineno, tb.tb_lasti))
+            tb = tb.tb_next
+
+        try:
+            message  = str(exc)
+            notes    = tuple(str(note) for note in getattr(exc, '__notes__', ()))
+        except Exception:
+            return None
+
+        chain.append((type(exc), message, notes, exc.__cause__ is not None, tuple(frames)))
+        exc = _chained(exc)
+
+    return tuple(chain), limit, chain_limit
+
+
+def _format(exception: BaseException, limit: int | None, chain_limit: int | None) -> str:
+    """Formats traceback without the last line end"""
+
+    import traceback
+
+    te = traceback.TracebackException(type(exception), exception, exception.__traceback__,
+                                      limit=limit, compact=True)
+    omitted = 0
+
+    if chain_limit is not None:
+        current  = te
+        depth    = 0
+
+        while current is not None:
+            following = _chained(current)
+
+            if following is not None and depth >= chain_limit:
+                # count omitted exceptions and cut the chain
+                while following is not None:
+                    omitted   += 1
+                    following = _chained(following)
+
+                current.__cause__    = None
+                current.__context__  = None
+                break
+
+            current  = following
+            depth    += 1
+
+    text = ''.join(te.format())[:-1]
+
+    if omitted:
+        text = f'[{omitted} chained exception(s) omitted]\n\n' + text
+
+    return text
+
+
+class TracebackCache:
+    """Bounded LRU cache of the formatted tracebacks. Thread-safe
+
+    :ivar size: Max count of the cached tracebacks
+    :type size: int
+    :ivar hits: Count of the tracebacks taken from the cache
+    :type hits: int
+    :ivar misses: Count of the formatted tracebacks
+    :type misses: int
+    """
+
+    def __init__(self, size: int = 256):
+        """
+        :param size: Max count of the cached tracebacks (0 - caching is disabled)
+        :type size: int
+        """
+
+        self.size    = size
+        self.hits    = 0
+        self.misses  = 0
+
+        self._lock   = threading.Lock()
+        self._items  = collections.OrderedDict()
+
+    def format(self, exception: BaseException, limit: int | None = None, chain_limit: int | None = None) -> str:
+        """Returns formatted traceback of the exception (from the cache, if the same traceback was formatted)
+
+        :param exception: Exception to format
+        :type exception: BaseException
+        :param limit: Max count of the frames of every exception (as ``limit`` of the :mod:`traceback`:
+                      negative value keeps the last frames). None - no limit
+        :type limit: int | None
+        :param chain_limit: Max count of the chained exceptions (causes and contexts), printed before
+                            the exception. None - no limit
+        :type chain_limit: int | None
+
+        :returns: Formatted traceback without the line end
+        :rtype: str
+        """
+
+        key = _cache_key(exception, limit, chain_limit) if self.size > 0 else None
+
+        if key is not None:
+            with self._lock:
+                text = self._items.get(key)
+
+                if text is not None:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return text
+
+        text = _format(exception, limit, chain_limit)
+
+        if key is not None:
+            with self._lock:
+                self.misses      += 1
+                self._items[key]  = text
+
+                while len(self._items) > self.size:
+                    self._items.popitem(last=False)
+
+        return text
+
+    def clear(self):
+        """Drops all cached tracebacks"""
+
+        with self._lock:
+            self._items.clear()
+            self.hits    = 0
+            self.misses  = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+TRACEBACK_CACHE = TracebackCache()
+"""Cache of the tracebacks, used by the records"""
+
+
+def format_traceback(exception: BaseException, limit: int | None = None, chain_limit: int | None = None) -> str:
+    """Formats traceback of the exception using :data:`TRACEBACK_CACHE` (see :meth:`TracebackCache.format`)
+
+    :returns: Formatted traceback without the line end
+    :rtype: str
+    """
+
+    return TRACEBACK_CACHE.format(exception, limit, chain_limit)
@@ -2,18 +2,19 @@
 Utilities of the logging library (such as LogLevel, level names, functions)
 """
 
-import colorama
+import os
+import sys
+import time
 import typing
-import inspect
 
-from ._types import ColorSetType
+from ._types import ColorSetType, LogLevelType
 
 if typing.TYPE_CHECKING:
     from .logger import Logger
 
-__all__ = ['LogLevel', 'level_names', 'level_to_color', 'level_to_name',
-           'type_to_color', 'register_log_level', 'make_logger_binding',
-           'register_bindings']
+__all__ = ['LogLevel', 'level_names', 'DISABLED_LEVEL', 'CallerInfo', 'NO_CALLER', 'ColorMap', 'color_resolver',
+           'level_to_color', 'level_to_name', 'name_to_level', 'type_to_color', 'register_log_level', 'make_logger_binding',
+           'register_bindings', 'rotated_segments']
 
 
 # log levels
@@ -41,8 +42,179 @@ level_names = {
 }
 
 
+DISABLED_LEVEL = float('inf')
+"""Effective level of the logger without handlers (no record passes it)"""
+
+
+# generation of the configuration
+
+class ConfigGeneration:
+    """Counter of the configuration changes (handlers, levels).
+       Loggers and groups cache precomputed values together with the generation
+       and recompute them only when the counter has changed
+    """
+
+    value = 0
+
+    @classmethod
+    def bump(cls):
+        """Marks all precomputed values of the loggers as outdated"""
+        cls.value += 1
+
+
+# caller information
+
+class CallerInfo:
+    """Lightweight information about the caller of the log function.
+       Replacement of the ``inspect.FrameInfo``, that keeps only code object and line number
+       of the frame. Other fields are computed only when formatter uses them.
+
+    :ivar lineno: Line number of the call
+    :type lineno: int
+    """
+
+    __slots__ = ('code', 'lineno')
+
+    def __init__(self, frame: typing.Any):
+        """
+        :param frame: Frame of the caller (returned by ``sys._getframe()``)
+        :type frame: FrameType
+        """
+
+        self.code    = frame.f_code
+        self.lineno  = frame.f_lineno
+
+    @property
+    def filename(self) -> str:
+        """File name of the caller"""
+        return self.code.co_filename
+
+    @property
+    def function(self) -> str:
+        """Function name of the caller"""
+        return self.code.co_name
+
+    @property
+    def code_context(self) -> list[str] | None:
+        """Source line of the call (reads it only on the first access)"""
+
+        import linecache
+
+        line = linecache.getline(self.code.co_filename, self.lineno)
+        return [line] if line else None
+
+    @property
+    def index(self) -> int | None:
+        """Index of the current line in the code_context (``inspect.FrameInfo`` compatibility)"""
+        return 0 if self.code_context is not None else None
+
+    def __repr__(self):
+        return f'CallerInfo(filename={self.filename!r}, lineno={self.lineno}, function={self.function!r})'
+
+
+class _NoCaller:
+    """Caller information used when capturing of the caller is disabled"""
+
+    __slots__ = ()
+
+    filename      = '?'
+    lineno        = 0
+    function      = '?'
+    code_context  = None
+    index         = None
+
+    def __repr__(self):
+        return 'NO_CALLER'
+
+
+NO_CALLER = _NoCaller()
+"""Caller information used when capturing of the caller is disabled"""
+
+
 # utilities
 
+class ColorMap(dict):
+    """Colors of the types (``types`` of the color set). Resolves color of the type by its MRO,
+       so subclasses are colored as their nearest base class in the map (``IntEnum`` as ``int``,
+       exceptions as ``Exception``). Resolved colors are cached per type, cache is cleared
+       when the map is changed
+    """
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any):
+        super().__init__(*args, **kwargs)
+
+        self._resolved = {}
+
+    def _changed(method):
+        def f(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._resolved = {}
+            return result
+
+        f.__name__ = method.__name__
+        f.__doc__ = method.__doc__
+        return f
+
+    __setitem__  = _changed(dict.__setitem__)
+    __delitem__  = _changed(dict.__delitem__)
+    __ior__      = _changed(dict.__ior__)
+    clear        = _changed(dict.clear)
+    pop          = _changed(dict.pop)
+    popitem      = _changed(dict.popitem)
+    setdefault   = _changed(dict.setdefault)
+    update       = _changed(dict.update)
+
+    del _changed
+
+    def resolve(self, type_: type | str) -> str:
+        """Returns color of the type (or of the special key, such as ``exception``)
+
+        :param type_: Type or key to resolve
+        :type type_: type | str
+
+        :returns: Color of the nearest class in the MRO of the type or ``all`` color
+        :rtype: str
+        """
+
+        color = self._resolved.get(type_)
+
+        if color is None:
+            color = self._resolved[type_] = _resolve_color(self, type_)
+
+        return color
+
+
+def _resolve_color(types: dict, type_: type | str) -> str:
+    """Looks up color of the type by its MRO"""
+
+    if type_ in types:
+        return types[type_]
+
+    for base in getattr(type_, '__mro__', ()):
+        if base in types:
+            return types[base]
+
+    return types.get('all', '')
+
+
+def color_resolver(color_set: ColorSetType) -> typing.Callable[[type | str], str]:
+    """Returns function, that resolves colors of the types by the color set.
+       Colors are cached if ``types`` of the color set is :class:`ColorMap`
+
+    :param color_set: Color set
+    :type color_set: ColorSetType
+
+    :returns: Function, that takes type (or special key) and returns its color
+    """
+
+    types = color_set['types']
+
+    if type(types) is ColorMap:
+        return types.resolve
+
+    return lambda type_: _resolve_color(types, type_)
+
+
 def level_to_color(level: int, color_set: ColorSetType) -> str:
     """Converts log level to color
 
@@ -51,11 +223,7 @@ def level_to_color(level: int, color_set: ColorSetType) -> str:
 
     :returns: String color of the level if level is registered, otherwise empty string
     """
-
-    if level in color_set['level']:
-        return color_set['level'][level]
-
-    return ''
+    return color_set['level'].get(level, '')
 
 
 def level_to_name(level: int) -> str:
@@ -72,8 +240,25 @@ def level_to_name(level: int) -> str:
     return ''
 
 
+def name_to_level(level: LogLevelType) -> int:
+    """Converts name of the log level (case-insensitive) to int
+
+    :param level: Name of the level or int level (returned as is)
+    :type level: LogLevelType
+
+    :returns: Int level
+    :raises KeyError: When level name isn't registered
+    """
+
+    if isinstance(level, int):
+        return level
+
+    return {v: k for k, v in level_names.items()}[level.upper()]
+
+
 def type_to_color(type_: type | str, color_set: ColorSetType) -> str:
-    """Converts type to the color
+    """Converts type to the color. Types without own color are colored as the nearest
+       base class of the color set (see :class:`ColorMap`)
 
     :param type_: Type to convert
     :param color_set: Color set from get colors of the types
@@ -81,10 +266,12 @@ def type_to_color(type_: type | str, color_set: ColorSetType) -> str:
     :returns: String with color of the type or returns color_set['types']['all'] color
     """
 
-    if type_ in color_set['types']:
-        return color_set['types'][type_]
+    types = color_set['types']
+
+    if type(types) is ColorMap:
+        return types.resolve(type_)
 
-    return color_set['types']['all']
+    return _resolve_color(types, type_)
 
 
 def register_log_level(level: int, level_name: str):
@@ -108,7 +295,25 @@ def make_logger_binding(level: int) -> ...:
     """
 
     def f(self: 'Logger', message: str, *args, exception: Exception | None = None):
-        self.record(message, *args, level=level, exception=exception, stack=inspect.stack()[1])
+        if self._generation != ConfigGeneration.value:
+            self.refresh()
+
+        # nothing to do, if all handlers reject this level
+        if level < self._min_level:
+            if self._metrics is not None:
+                self._metrics.count_filtered()
+            return
+
+        if self._metrics is not None:
+            started  = time.perf_counter_ns()
+            stack    = CallerInfo(sys._getframe(1)) if self._capture_caller else NO_CALLER
+            self._metrics.add_capture(time.perf_counter_ns() - started)
+
+            self.record(message, *args, level=level, exception=exception, stack=stack)
+            return
+
+        self.record(message, *args, level=level, exception=exception,
+                    stack=CallerInfo(sys._getframe(1)) if self._capture_caller else NO_CALLER)
 
     return f
 
@@ -123,3 +328,25 @@ def register_bindings(cls: 'Logger'):
     # make bindings to the all log levels
     for level, name in level_names.items():
         setattr(cls, name.lower(), make_logger_binding(level))
+
+
+def rotated_segments(path: str) -> list[str]:
+    """Returns rotated segments of the log (see :class:`ezlog.handlers.RotatingFileHandler`),
+       from the oldest to the newest
+
+    :param path: Path to the log
+    :type path: str
+
+    :returns: Paths of the segments
+    :rtype: list[str]
+    """
+
+    import re
+
+    directory, name = os.path.split(os.path.abspath(path))
+    pattern = re.compile(re.escape(name) + r'\.\d{8}-\d{6}(-\d+)?(\.gz|\.xz)?')
+
+    found = [m for m in os.listdir(directory) if pattern.fullmatch(m)]
+    found.sort(key=lambda m: [int(n) for n in re.findall(r'\d+', m[len(name):])])
+
+    return [os.path.join(directory, m) for m in found]
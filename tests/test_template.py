@@ -0,0 +1,123 @@
+"""
+Compiled templates must render the same text (and raise the same errors) as ``str.format``
+"""
+
+import types
+
+import pytest
+
+from ezlog.template import compile_template, message_template
+
+POINT = types.SimpleNamespace(x=1, y=2.5, name='point')
+
+CASES = [
+    # literals and escapes
+    ('', (), {}),
+    ('plain text', (), {}),
+    ('{{}}', (), {}),
+    ('{{{}}}', (1,), {}),
+    ('{{name}} = {name}', (), {'name': 'value'}),
+    ('}}{{', (), {}),
+
+    # auto and manual numbering
+    ('{} {} {}', (1, 'two', 3.0), {}),
+    ('{0} {1} {0}', ('a', 'b'), {}),
+    ('{1}{0}', ('a', 'b'), {}),
+    ('{} and {name}', (1,), {'name': 'kw'}),
+
+    # conversions
+    ('{!r}', ('text',), {}),
+    ('{!s}', (b'bytes',), {}),
+    ('{!a}', ('ü',), {}),
+    ('{0!r:>12}', ('text',), {}),
+
+    # format specs
+    ('{:>10}', ('right',), {}),
+    ('{:*^11}', ('mid',), {}),
+    ('{:.3f}', (3.14159,), {}),
+    ('{:08.2f}', (-3.5,), {}),
+    ('{:,}', (1234567,), {}),
+    ('{:x} {:#o} {:b}', (255, 8, 5), {}),
+    ('{:%}', (0.25,), {}),
+    ('{value:<6}|', (), {'value': 'ab'}),
+
+    # attributes and indexes
+    ('{0.x} {0.y:.1f} {0.name!r}', (POINT,), {}),
+    ('{p.name}', (), {'p': POINT}),
+    ('{0[0]} {0[2]}', ([10, 20, 30],), {}),
+    ('{d[key]} {d[other]}', (), {'d': {'key': 1, 'other': 2}}),
+    ('{0[key][1]}', ({'key': 'ab'},), {}),
+    ('{0.__class__.__name__}', (POINT,), {}),
+
+    # nested fields in the spec (rendered by str.format)
+    ('{:{}}', ('x', 5), {}),
+    ('{0:>{1}}', ('x', 4), {}),
+    ('{value:{width}.{precision}f}', (), {'value': 2.71828, 'width': 8, 'precision': 2}),
+]
+
+ERRORS = [
+    # unmatched braces
+    ('{', (), {}),
+    ('}', (), {}),
+    ('{0', (0,), {}),
+
+    # mixed numbering
+    ('{} {0}', (1,), {}),
+    ('{0} {}', (1,), {}),
+
+    # missing arguments
+    ('{} {}', (1,), {}),
+    ('{2}', (1,), {}),
+    ('{name}', (), {}),
+    ('{0.missing}', (POINT,), {}),
+    ('{0[5]}', ([1],), {}),
+    ('{0[key]}', ({},), {}),
+
+    # bad conversions and specs
+    ('{!x}', (1,), {}),
+    ('{:d}', ('text',), {}),
+    ('{:.2f}', ('text',), {}),
+    ('{:%Q}', (1,), {}),
+]
+
+
+@pytest.mark.parametrize('template, args, kwargs', CASES)
+def test_render_equals_format(template: str, args: tuple, kwargs: dict):
+    assert compile_template(template).render(args, kwargs) == template.format(*args, **kwargs)
+
+
+@pytest.mark.parametrize('template, args, kwargs', ERRORS)
+def test_errors_equal_format(template: str, args: tuple, kwargs: dict):
+    with pytest.raises(Exception) as expected:
+        template.format(*args, **kwargs)
+
+    with pytest.raises(expected.type):
+        compile_template(template).render(args, kwargs)
+
+
+def test_nested_spec_is_not_compiled():
+    template = compile_template('{:{}}')
+
+    assert template.fields is None
+    assert template.render(('x', 3), {}) == 'x  '
+
+
+def test_fields():
+    assert compile_template('{a} {b.c} {d[0]} {}').fields == frozenset({'a', 'b', 'd'})
+    assert compile_template('text').fields == frozenset()
+
+
+def test_message_is_compiled_when_repeated():
+    message = 'repeated message {} {name}'
+
+    first   = message_template(message)
+    second  = message_template(message)
+
+    assert first.fields is None
+    assert second.fields == frozenset({'name'})
+    assert message_template(message) is second
+
+    for template in (first, second):
+        assert template.render((1,), {'name': 'kw'}) == 'repeated message 1 kw'
+
+    assert message_template('no fields').fields == frozenset()